@@ -1,22 +1,129 @@
+import json
+from datetime import datetime
+
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.utils import timezone
+from django.utils.functional import cached_property
+
 from .models import ChatSession, Message, DeliveryTracking
+from .search import build_search_query
+
+# Di bawah estimasi ini paginator tetap memakai COUNT(*) yang akurat
+EXACT_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator yang memakai estimasi planner PostgreSQL, bukan COUNT(*) penuh"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate < EXACT_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+
+class IndexedDateQuerySet(models.QuerySet):
+    """QuerySet changelist dengan drilldown date_hierarchy yang ramah index.
+
+    Default Django menjalankan DISTINCT date_trunc() atas seluruh baris pada
+    level drilldown. Di sini setiap tahun/bulan/hari dicek dengan EXISTS pada
+    rentang waktu, yang cukup dijawab dari index kolom tanggal.
+    """
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None):
+        if kind not in ('year', 'month', 'day'):
+            return super().datetimes(field_name, kind, order, tzinfo)
+
+        bounds = self.aggregate(first=models.Min(field_name), last=models.Max(field_name))
+        if bounds['first'] is None:
+            return []
+
+        tz = tzinfo or timezone.get_current_timezone()
+        first = timezone.localtime(bounds['first'], tz)
+        last = timezone.localtime(bounds['last'], tz)
+
+        periods = []
+        start = self._truncate(first, kind, tz)
+        while start <= last:
+            end = self._next_period(start, kind, tz)
+            if self.filter(**{f'{field_name}__gte': start, f'{field_name}__lt': end}).exists():
+                periods.append(start)
+            start = end
+
+        return periods if order == 'ASC' else periods[::-1]
+
+    @staticmethod
+    def _truncate(moment, kind, tz):
+        month = moment.month if kind != 'year' else 1
+        day = moment.day if kind == 'day' else 1
+        return timezone.make_aware(datetime(moment.year, month, day), tz)
+
+    @staticmethod
+    def _next_period(start, kind, tz):
+        if kind == 'year':
+            return timezone.make_aware(datetime(start.year + 1, 1, 1), tz)
+        if kind == 'month':
+            year, month = divmod(start.month, 12)
+            return timezone.make_aware(datetime(start.year + year, month + 1, 1), tz)
+        next_day = datetime.fromordinal(start.date().toordinal() + 1)
+        return timezone.make_aware(next_day, tz)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Mode performa admin untuk tabel besar"""
+    paginator = EstimatedCountPaginator
+    # Hindari COUNT(*) kedua atas seluruh tabel untuk teks "x dari total"
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return IndexedDateQuerySet(model=queryset.model, query=queryset.query, using=queryset.db)
 
 @admin.register(ChatSession)
-class ChatSessionAdmin(admin.ModelAdmin):
+class ChatSessionAdmin(LargeTableAdmin):
     list_display = ['session_id', 'user', 'created_at', 'is_active']
     list_filter = ['is_active', 'created_at']
+    list_select_related = ['user']
     search_fields = ['session_id']
+    raw_id_fields = ['user']
+    date_hierarchy = 'created_at'
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(LargeTableAdmin):
     list_display = ['session', 'content_preview', 'is_user', 'timestamp']
     list_filter = ['is_user', 'timestamp']
+    list_select_related = ['session']
+    autocomplete_fields = ['session']
+    date_hierarchy = 'timestamp'
+    search_fields = ['content']
+    search_help_text = 'Full-text search: "frasa persis", kata1 OR kata2, -kata'
+
+    def get_search_results(self, request, queryset, search_term):
+        # Pakai GIN index search_vector, bukan icontains yang scan seluruh tabel
+        if not search_term:
+            return queryset, False
+        return queryset.filter(search_vector=build_search_query(search_term)), False
     
     def content_preview(self, obj):
         return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
 
 @admin.register(DeliveryTracking)
-class DeliveryTrackingAdmin(admin.ModelAdmin):
+class DeliveryTrackingAdmin(LargeTableAdmin):
     list_display = ['tracking_number', 'status', 'recipient_name', 'current_location', 'rating']
     list_filter = ['status', 'rating']
-    search_fields = ['tracking_number', 'recipient_name']
\ No newline at end of file
+    search_fields = ['tracking_number', 'recipient_name']
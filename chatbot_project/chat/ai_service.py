@@ -1,56 +1,75 @@
-import openai
 from django.conf import settings
+from django.core.cache import cache
 import json
 import re
 import logging
+from .llm_router import get_router
 from .models import DeliveryTracking
+from .tracking_index import tracking_index
 
 logger = logging.getLogger(__name__)
 
+# Kata kunci per intent, dicek berurutan; intent pertama yang cocok dipakai
+INTENT_KEYWORDS = [
+    ('tracking', ['resi', 'tracking', 'nomor', 'cek', 'lacak']),
+    ('damaged', ['rusak', 'pecah', 'hancur', 'cacat', 'beda']),
+    ('delayed', ['terlambat', 'lama', 'belum sampai', 'delay', 'lambat']),
+    ('rating', ['rating', 'bintang', 'nilai', 'review', 'puas', 'bagus', 'buruk']),
+    ('greeting', ['halo', 'hai', 'hello', 'selamat', 'pagi', 'siang', 'sore', 'malam']),
+]
+
+# Dicocokkan per kata utuh: substring biasa membuat 'lama' cocok di "selamat"
+# dan 'beda' di "berbeda"
+INTENT_PATTERNS = [
+    (intent, re.compile(r'\b(?:' + '|'.join(re.escape(word) for word in keywords) + r')\b'))
+    for intent, keywords in INTENT_KEYWORDS
+]
+
+
+def delivery_cache_key(tracking_number):
+    """Cache key untuk data pengiriman sebuah nomor resi"""
+    return f"delivery:{tracking_number}"
+
+
 class DeliveryAIService:
     def __init__(self):
-        # Initialize OpenAI client dengan API key dari settings
-        if settings.OPENAI_API_KEY:
-            self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.api_available = True
-        else:
-            self.client = None
-            self.api_available = False
+        # Router memilih provider/model per intent sesuai settings.LLM_PROVIDER
+        self.router = get_router()
+        self.api_available = self.router.available
+        if not self.api_available:
             logger.warning("OpenAI API key not configured")
         
     def get_delivery_data(self, tracking_number):
-        """Simulasi data pengiriman berdasarkan tracking number"""
+        """Data pengiriman berdasarkan tracking number, None jika tidak terdaftar"""
+        # Cek index in-memory dulu supaya resi salah/typo tidak query ke database
+        if tracking_number not in tracking_index:
+            return None
+
+        # Hanya aktif dengan cache bersama (REDIS_URL), lihat DELIVERY_CACHE_TIMEOUT
+        cache_timeout = settings.DELIVERY_CACHE_TIMEOUT
+        if cache_timeout:
+            cached = cache.get(delivery_cache_key(tracking_number))
+            if cached is not None:
+                return cached
+
         try:
             delivery = DeliveryTracking.objects.get(tracking_number=tracking_number)
-            return {
-                'tracking_number': delivery.tracking_number,
-                'status': delivery.status,
-                'current_location': delivery.current_location,
-                'recipient_name': delivery.recipient_name,
-                'recipient_phone': delivery.recipient_phone,
-                'issues': delivery.issues,
-                'rating': delivery.rating,
-                'delivery_date': delivery.delivery_date
-            }
         except DeliveryTracking.DoesNotExist:
-            # Simulasi data jika tidak ada di database
-            import random
-            status_options = [
-                'picked_up', 'in_transit', 'in_warehouse', 
-                'out_for_delivery', 'delivered', 'delayed'
-            ]
-            locations = ['Jakarta', 'Surabaya', 'Medan', 'Bandung', 'Yogyakarta', 'Denpasar']
-            
-            return {
-                'tracking_number': tracking_number,
-                'status': random.choice(status_options),
-                'current_location': random.choice(locations),
-                'recipient_name': 'Customer',
-                'recipient_phone': '081234567890',
-                'issues': '',
-                'rating': None,
-                'delivery_date': None
-            }
+            return None
+
+        data = {
+            'tracking_number': delivery.tracking_number,
+            'status': delivery.status,
+            'current_location': delivery.current_location,
+            'recipient_name': delivery.recipient_name,
+            'recipient_phone': delivery.recipient_phone,
+            'issues': delivery.issues,
+            'rating': delivery.rating,
+            'delivery_date': delivery.delivery_date
+        }
+        if cache_timeout:
+            cache.set(delivery_cache_key(tracking_number), data, cache_timeout)
+        return data
     
     def extract_tracking_number(self, message):
         """Extract tracking number dari pesan user"""
@@ -58,7 +77,7 @@ class DeliveryAIService:
         patterns = [
             r'\b[A-Z]{2,3}[0-9]{8,12}\b',  # FDE123456789
             r'\b[0-9]{10,15}\b',           # 1234567890123
-            r'\b[A-Z0-9]{8,15}\b'          # Mixed alphanumeric
+            r'\b(?=[A-Z]*[0-9])[A-Z0-9]{8,15}\b'  # Mixed alphanumeric, minimal satu angka
         ]
         
         for pattern in patterns:
@@ -67,8 +86,21 @@ class DeliveryAIService:
                 return matches[0]
         return None
     
+    @staticmethod
+    def detect_intent(message):
+        """Deteksi intent pesan berdasarkan kata kunci"""
+        message_lower = message.lower()
+        for intent, pattern in INTENT_PATTERNS:
+            if pattern.search(message_lower):
+                return intent
+        return 'general'
+
     def generate_response(self, user_message, context=None):
-        """Generate AI response menggunakan OpenAI ChatGPT"""
+        """Generate AI response menggunakan OpenAI ChatGPT.
+
+        Return (response, delivery_data); delivery_data None jika pesan tidak
+        berisi nomor resi yang terdaftar, supaya caller tidak perlu lookup ulang.
+        """
         
         # Extract tracking number dari pesan
         tracking_number = self.extract_tracking_number(user_message)
@@ -76,6 +108,9 @@ class DeliveryAIService:
         
         if tracking_number:
             delivery_data = self.get_delivery_data(tracking_number)
+            if delivery_data is None:
+                # Resi tidak terdaftar: jawab langsung tanpa LLM call
+                return self.get_not_found_response(tracking_number, tracking_index.suggest(tracking_number)), None
         
         # System prompt untuk ChatGPT
         system_prompt = """
@@ -131,37 +166,55 @@ class DeliveryAIService:
             - Rating: {delivery_data['rating'] or 'Belum ada rating'}
             """
         
-        # Coba gunakan OpenAI API
+        # Coba gunakan LLM lewat router (model & max_tokens per intent)
         if self.api_available:
+            intent = self.detect_intent(user_message)
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.7,
-                    timeout=10  # 10 detik timeout
-                )
-                
-                ai_response = response.choices[0].message.content.strip()
-                logger.info(f"OpenAI API response successful for message: {user_message[:50]}")
-                return ai_response
+                ai_response, route = self.router.complete(intent, [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ])
+                logger.info("LLM response via %s (intent %s) for message: %s",
+                            route['model'], intent, user_message[:50],
+                            extra={'event': 'llm_response', 'model': route['model'], 'intent': intent})
+                return ai_response, delivery_data
                 
             except Exception as e:
-                logger.error(f"OpenAI API error: {e}")
-                return self.get_fallback_response(user_message, delivery_data)
+                logger.error("LLM router error: %s", e, extra={'event': 'llm_error'})
+                return self.get_fallback_response(user_message, delivery_data), delivery_data
         else:
-            return self.get_fallback_response(user_message, delivery_data)
+            return self.get_fallback_response(user_message, delivery_data), delivery_data
     
+    def get_not_found_response(self, tracking_number, suggestions):
+        """Response untuk nomor resi yang tidak ada, dengan saran jika mirip resi lain"""
+        if suggestions:
+            suggestion_list = "\n".join(f"- **{number}**" for number in suggestions)
+            return f"""🔍 **Nomor Resi Tidak Ditemukan**
+
+📦 Nomor Resi: **{tracking_number}**
+
+Mungkin maksud Anda:
+{suggestion_list}
+
+Ketik: **"Cek resi [NOMOR_RESI]"** dengan nomor yang benar. 📱"""
+
+        return f"""🔍 **Nomor Resi Tidak Ditemukan**
+
+📦 Nomor Resi: **{tracking_number}**
+
+Nomor resi ini belum terdaftar di sistem kami. Mohon periksa kembali nomor resi pada bukti pengiriman Anda.
+
+**Contoh format nomor resi:** FDE123456789
+
+Butuh bantuan? Hubungi call center **1500-888**. 📞"""
+
     def get_fallback_response(self, user_message, delivery_data=None):
         """Fallback response jika OpenAI tidak tersedia"""
         
-        message_lower = user_message.lower()
+        intent = self.detect_intent(user_message)
         
         # Cek tracking number
-        if any(word in message_lower for word in ['resi', 'tracking', 'nomor', 'cek', 'lacak']):
+        if intent == 'tracking':
             if delivery_data:
                 status_map = {
                     'picked_up': 'Paket sudah diambil dari pengirim',
@@ -241,7 +294,7 @@ Ketik: **"Cek resi [NOMOR_RESI]"**
 Atau langsung ketik nomor resi Anda! 📱"""
         
         # Masalah paket rusak
-        elif any(word in message_lower for word in ['rusak', 'pecah', 'hancur', 'cacat', 'beda']):
+        elif intent == 'damaged':
             return """😔 **Laporan Paket Rusak**
 
 Kami sangat menyesal mendengar paket Anda mengalami kerusakan.
@@ -257,7 +310,7 @@ Kami sangat menyesal mendengar paket Anda mengalami kerusakan.
 Tim kami akan memastikan Anda mendapat kompensasi yang sesuai. 🤝"""
         
         # Masalah keterlambatan
-        elif any(word in message_lower for word in ['terlambat', 'lama', 'belum sampai', 'delay', 'lambat']):
+        elif intent == 'delayed':
             return """⏰ **Penanganan Keterlambatan**
 
 Kami memahami kekhawatiran Anda tentang keterlambatan pengiriman.
@@ -273,7 +326,7 @@ Kami memahami kekhawatiran Anda tentang keterlambatan pengiriman.
 Kami berkomitmen menyelesaikan masalah ini dengan cepat. 🚀"""
         
         # Rating dan feedback
-        elif any(word in message_lower for word in ['rating', 'bintang', 'nilai', 'review', 'puas', 'bagus', 'buruk']):
+        elif intent == 'rating':
             return """⭐ **Rating & Feedback**
 
 Terima kasih atas feedback Anda!
@@ -292,7 +345,7 @@ Rating Anda sangat membantu kami meningkatkan kualitas layanan FastDelivery Expr
 Ada saran atau masukan lain? 💭"""
         
         # Sapaan
-        elif any(word in message_lower for word in ['halo', 'hai', 'hello', 'selamat', 'pagi', 'siang', 'sore', 'malam']):
+        elif intent == 'greeting':
             return """👋 **Selamat datang di FastDelivery Express!**
 
 Saya adalah asisten AI customer service yang siap membantu Anda 24/7.
@@ -0,0 +1,49 @@
+# chat/consumers.py
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .models import TrackingSubscription
+from .notifications import session_group_name, tracking_group_name
+
+
+class TrackingConsumer(AsyncJsonWebsocketConsumer):
+    """Push update status paket ke sesi chat yang berlangganan"""
+
+    async def connect(self):
+        self.session_id = self.scope['url_route']['kwargs']['session_id']
+        self.groups_joined = set()
+
+        await self.join(session_group_name(self.session_id))
+        for tracking_number in await self.get_subscriptions():
+            await self.join(tracking_group_name(tracking_number))
+
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        for group in self.groups_joined:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        self.groups_joined.clear()
+
+    async def join(self, group):
+        if group not in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+            self.groups_joined.add(group)
+
+    @database_sync_to_async
+    def get_subscriptions(self):
+        return list(
+            TrackingSubscription.objects.filter(session__session_id=self.session_id)
+            .values_list('tracking_number', flat=True)
+        )
+
+    async def tracking_subscribe(self, event):
+        await self.join(tracking_group_name(event['tracking_number']))
+
+    async def tracking_update(self, event):
+        await self.send_json({
+            'type': 'tracking_update',
+            'tracking_number': event['tracking_number'],
+            'status': event['status'],
+            'current_location': event['current_location'],
+            'message': event['message'],
+        })
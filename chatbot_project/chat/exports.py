@@ -0,0 +1,101 @@
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ChatSession, Message
+
+# Baris NDJSON digabung sampai ukuran ini sebelum dikirim ke client/file
+FLUSH_BYTES = 64 * 1024
+
+
+def parse_export_range(start, end):
+    """Parse rentang tanggal export; tanggal tanpa jam untuk `end` dihitung inklusif"""
+    def parse(value, inclusive_end=False):
+        # Cek tanggal saja lebih dulu: di Python >= 3.11 parse_datetime juga
+        # menerima '2026-10-31' sehingga akhir inklusif tidak akan terpakai.
+        day = parse_date(value)
+        if day is not None:
+            moment = datetime.combine(day + timedelta(days=1) if inclusive_end else day, time.min)
+        else:
+            moment = parse_datetime(value)
+            if moment is None:
+                raise ValueError(f"Format tanggal tidak valid: {value}")
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+    start, end = parse(start), parse(end, inclusive_end=True)
+    if start >= end:
+        raise ValueError("Tanggal awal harus sebelum tanggal akhir")
+    return start, end
+
+
+def iter_conversation_records(start, end, chunk_size=2000):
+    """Yield dict ChatSession lalu Message dalam rentang waktu.
+
+    `.iterator()` memakai server-side cursor di PostgreSQL sehingga memori
+    tetap konstan (kecuali DISABLE_SERVER_SIDE_CURSORS aktif untuk pgbouncer).
+    """
+    sessions = (
+        ChatSession.objects.filter(created_at__gte=start, created_at__lt=end)
+        .order_by('pk')
+        .values('id', 'session_id', 'user_id', 'created_at', 'is_active')
+    )
+    for session in sessions.iterator(chunk_size=chunk_size):
+        yield {'type': 'session', **session}
+
+    messages = (
+        Message.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by('pk')
+        .values('id', 'session__session_id', 'content', 'is_user', 'timestamp')
+    )
+    for message in messages.iterator(chunk_size=chunk_size):
+        message['session_id'] = message.pop('session__session_id')
+        yield {'type': 'message', **message}
+
+
+def iter_ndjson(records):
+    """Serialisasi record ke NDJSON dalam potongan bytes ~FLUSH_BYTES"""
+    buffer = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b'\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def iter_gzip(chunks):
+    """Kompres stream bytes ke format gzip secara inkremental"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def aiter_sync(iterator):
+    """Bungkus iterator sync (ORM) sebagai async iterator untuk streaming di ASGI.
+
+    Tanpa ini Django mengumpulkan seluruh iterator sync ke memori sebelum
+    mengirim response di bawah ASGI.
+    """
+    iterator = iter(iterator)
+    sentinel = object()
+    fetch = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await fetch(iterator, sentinel)
+        if chunk is sentinel:
+            break
+        yield chunk
@@ -0,0 +1,85 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+# Interval polling saat request dengan key yang sama masih diproses
+POLL_INTERVAL = 0.1
+
+
+def _replay(entry):
+    response = HttpResponse(entry['content'], status=entry['status'], content_type=entry['content_type'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """Jalankan view sekali per header Idempotency-Key.
+
+    Response pertama disimpan di cache selama IDEMPOTENCY_TTL dan dikirim ulang
+    untuk retry dengan key yang sama. Retry yang datang saat request pertama
+    masih berjalan menunggu hasilnya, bukan memproses ulang. Untuk deployment
+    multi-worker butuh cache bersama (REDIS_URL).
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.META.get('HTTP_IDEMPOTENCY_KEY', '').strip()
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > 255:
+            return JsonResponse({
+                'error': 'Idempotency-Key terlalu panjang (maksimal 255 karakter)',
+                'status': 'error'
+            }, status=400)
+
+        cache_key = f"idempotency:{view.__name__}:{hashlib.sha256(key.encode()).hexdigest()}"
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+
+        while True:
+            # cache.add atomik: hanya satu request yang mendapat hak memproses key ini
+            if cache.add(cache_key, {'state': 'pending', 'fingerprint': fingerprint},
+                         settings.IDEMPOTENCY_PENDING_TTL):
+                break
+
+            entry = cache.get(cache_key)
+            if entry is None:
+                # Request sebelumnya gagal atau pending-nya kedaluwarsa, coba ambil alih
+                continue
+            if entry['fingerprint'] != fingerprint:
+                return JsonResponse({
+                    'error': 'Idempotency-Key sudah dipakai untuk request yang berbeda',
+                    'status': 'error'
+                }, status=422)
+            if entry['state'] == 'done':
+                return _replay(entry)
+            if time.monotonic() >= deadline:
+                return JsonResponse({
+                    'error': 'Request dengan Idempotency-Key ini masih diproses',
+                    'status': 'error'
+                }, status=409)
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if response.status_code >= 500 or response.streaming:
+            # Error server tidak disimpan supaya retry bisa mencoba lagi
+            cache.delete(cache_key)
+        else:
+            cache.set(cache_key, {
+                'state': 'done',
+                'fingerprint': fingerprint,
+                'status': response.status_code,
+                'content': response.content,
+                'content_type': response['Content-Type'],
+            }, settings.IDEMPOTENCY_TTL)
+        return response
+
+    return wrapper
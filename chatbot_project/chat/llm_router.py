@@ -0,0 +1,227 @@
+import collections
+import hashlib
+import logging
+import statistics
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Kandidat model per intent, dicoba berurutan. Bisa di-override lewat settings.LLM_ROUTES.
+DEFAULT_ROUTES = {
+    'greeting': [
+        {'model': 'gpt-4o-mini', 'max_tokens': 150},
+        {'model': 'gpt-3.5-turbo', 'max_tokens': 150},
+    ],
+    'rating': [
+        {'model': 'gpt-4o-mini', 'max_tokens': 200},
+        {'model': 'gpt-3.5-turbo', 'max_tokens': 200},
+    ],
+    'tracking': [
+        {'model': 'gpt-4o-mini', 'max_tokens': 300},
+        {'model': 'gpt-3.5-turbo', 'max_tokens': 300},
+    ],
+    'delayed': [
+        {'model': 'gpt-4o-mini', 'max_tokens': 400},
+        {'model': 'gpt-3.5-turbo', 'max_tokens': 400},
+    ],
+    'damaged': [
+        {'model': 'gpt-4o', 'max_tokens': 500},
+        {'model': 'gpt-4o-mini', 'max_tokens': 500},
+        {'model': 'gpt-3.5-turbo', 'max_tokens': 500},
+    ],
+    'general': [
+        {'model': 'gpt-4o-mini', 'max_tokens': 300},
+        {'model': 'gpt-3.5-turbo', 'max_tokens': 300},
+    ],
+}
+
+
+_openai_client = None
+
+
+def get_openai_client():
+    """Client OpenAI dibuat sekali per proses.
+
+    Import openai (beserta httpx/pydantic) ditunda sampai benar-benar
+    dibutuhkan, sehingga worker tanpa API key tidak menanggung biayanya.
+    Retry bawaan SDK dimatikan: fallback antar model sudah ditangani router
+    dan dibatasi LLM_DEADLINE.
+    """
+    global _openai_client
+    if _openai_client is None:
+        import openai
+        _openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+    return _openai_client
+
+
+class LLMUnavailable(Exception):
+    """Semua kandidat model gagal atau sedang dihindari"""
+
+
+class OpenAIProvider:
+    name = 'openai'
+
+    @property
+    def available(self):
+        return bool(settings.OPENAI_API_KEY)
+
+    def complete(self, model, messages, max_tokens, timeout):
+        response = get_openai_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.7,
+            timeout=timeout,
+        )
+        return response.choices[0].message.content.strip()
+
+
+class StubProvider:
+    """Provider lokal deterministik untuk menjalankan dan benchmark pipeline secara offline"""
+    name = 'stub'
+    available = True
+
+    def __init__(self, latency_ms=None):
+        self.latency = (latency_ms if latency_ms is not None else settings.LLM_STUB_LATENCY_MS) / 1000
+
+    def complete(self, model, messages, max_tokens, timeout):
+        prompt = messages[-1]['content']
+        digest = hashlib.sha1(f"{model}:{prompt}".encode()).hexdigest()[:8]
+        # Latency simulasi sebanding dengan batas token, tetap deterministik
+        latency = self.latency * max_tokens / 500
+        if latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Stub {model} timed out after {timeout:.1f}s")
+        time.sleep(latency)
+
+        lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+        summary = '\n'.join(lines[:8])
+        return f"🤖 [{model} #{digest}]\n\n{summary}"[:max_tokens * 4]
+
+
+PROVIDERS = {
+    'openai': OpenAIProvider,
+    'stub': StubProvider,
+}
+
+
+class ModelStats:
+    """Rolling latency dan error rate untuk satu model"""
+
+    def __init__(self, window):
+        self.samples = collections.deque(maxlen=window)
+        self.open_until = 0.0
+
+    def record(self, latency, ok):
+        self.samples.append((latency, ok))
+
+    @property
+    def error_rate(self):
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    @property
+    def p50_latency(self):
+        latencies = [latency for latency, ok in self.samples if ok]
+        return statistics.median(latencies) if latencies else 0.0
+
+    def snapshot(self):
+        return {
+            'samples': len(self.samples),
+            'error_rate': round(self.error_rate, 3),
+            'p50_latency_ms': round(self.p50_latency * 1000, 1),
+            'avoided': self.open_until > time.monotonic(),
+        }
+
+
+class ModelRouter:
+    """Pilih model per intent dan hindari model yang lambat atau sering error"""
+
+    def __init__(self, provider, routes=None):
+        self.provider = provider
+        self.routes = routes or DEFAULT_ROUTES
+        self.window = settings.LLM_STATS_WINDOW
+        self.min_samples = settings.LLM_MIN_SAMPLES
+        self.max_error_rate = settings.LLM_MAX_ERROR_RATE
+        self.latency_budget = settings.LLM_LATENCY_BUDGET
+        self.cooldown = settings.LLM_COOLDOWN
+        self.timeout = settings.LLM_TIMEOUT
+        self.deadline = settings.LLM_DEADLINE
+        self._stats = collections.defaultdict(lambda: ModelStats(self.window))
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return self.provider.available
+
+    def candidates(self, intent):
+        """Kandidat route untuk intent, yang sedang dihindari dipindah ke belakang"""
+        routes = self.routes.get(intent) or self.routes['general']
+        now = time.monotonic()
+        with self._lock:
+            healthy = [route for route in routes if self._stats[route['model']].open_until <= now]
+            avoided = [route for route in routes if self._stats[route['model']].open_until > now]
+        return healthy + avoided
+
+    def complete(self, intent, messages):
+        """Return (teks, route) dari kandidat pertama yang berhasil dalam LLM_DEADLINE"""
+        deadline = time.monotonic() + self.deadline
+        for route in self.candidates(intent):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("LLM deadline %.0fs exceeded for intent '%s'", self.deadline, intent,
+                               extra={'event': 'llm_deadline_exceeded', 'intent': intent})
+                break
+            started = time.monotonic()
+            try:
+                text = self.provider.complete(
+                    route['model'], messages, route['max_tokens'], min(self.timeout, remaining)
+                )
+            except Exception as e:
+                self.record(route['model'], time.monotonic() - started, False)
+                logger.error("LLM %s/%s error: %s", self.provider.name, route['model'], e,
+                             extra={'event': 'llm_model_error', 'model': route['model']})
+                continue
+            self.record(route['model'], time.monotonic() - started, True)
+            return text, route
+        raise LLMUnavailable(f"Tidak ada model yang berhasil untuk intent '{intent}'")
+
+    def record(self, model, latency, ok):
+        with self._lock:
+            stats = self._stats[model]
+            stats.record(latency, ok)
+            if len(stats.samples) < self.min_samples:
+                return
+            if stats.error_rate > self.max_error_rate or stats.p50_latency > self.latency_budget:
+                logger.warning(
+                    "Avoiding model %s for %ss (error rate %.0f%%, p50 %.0fms)",
+                    model, self.cooldown, stats.error_rate * 100, stats.p50_latency * 1000,
+                    extra={'event': 'llm_model_avoided', 'model': model},
+                )
+                stats.open_until = time.monotonic() + self.cooldown
+                # Setelah cooldown model dinilai ulang dari sampel baru
+                stats.samples.clear()
+
+    def stats(self):
+        with self._lock:
+            return {model: stats.snapshot() for model, stats in self._stats.items()}
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Router per proses sesuai settings.LLM_PROVIDER"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            provider_class = PROVIDERS.get(settings.LLM_PROVIDER)
+            if provider_class is None:
+                raise ValueError(f"Unknown LLM_PROVIDER: {settings.LLM_PROVIDER}")
+            _router = ModelRouter(provider_class(), getattr(settings, 'LLM_ROUTES', None))
+        return _router
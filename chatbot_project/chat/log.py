@@ -0,0 +1,111 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+request_id_var = contextvars.ContextVar('request_id', default=None)
+stage_timings_var = contextvars.ContextVar('stage_timings', default=None)
+
+# Atribut bawaan LogRecord; sisanya dianggap field tambahan dari `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+@contextmanager
+def stage(name):
+    """Catat durasi satu tahap request (ms) ke stage timings request saat ini"""
+    timings = stage_timings_var.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def get_stage_timings():
+    return dict(stage_timings_var.get() or {})
+
+
+class RequestContextFilter(logging.Filter):
+    """Tambahkan request_id dari context request ke setiap record"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Sampling per event untuk log volume tinggi.
+
+    `rates` memetakan nama event (extra={'event': ...}) ke fraksi yang disimpan.
+    Record WARNING ke atas tidak pernah di-sample.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates or {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, 'event', None), 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu record = satu baris JSON"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class BackgroundJsonHandler(logging.handlers.QueueHandler):
+    """QueueHandler dengan QueueListener sendiri yang menulis JSON di thread background.
+
+    Di thread request hanya `msg % args` yang dirender (supaya argumen mutable
+    tercatat sesuai nilainya saat logging), lalu record masuk queue; encoding JSON
+    dan I/O ke file/stderr terjadi di thread listener. Jika queue penuh record
+    dibuang, bukan menunggu.
+    """
+
+    def __init__(self, filename=None, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        target = logging.FileHandler(filename) if filename else logging.StreamHandler(sys.stderr)
+        target.setFormatter(JsonFormatter())
+        self.dropped = 0
+        self.listener = logging.handlers.QueueListener(self.queue, target)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def prepare(self, record):
+        # Hanya dipanggil untuk record yang lolos level dan sampling. Berbeda dengan
+        # QueueHandler default, format() (JSON, traceback) tidak dijalankan di sini.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,65 @@
+import statistics
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from chat import llm_router
+from chat.ai_service import DeliveryAIService
+
+SAMPLE_MESSAGES = [
+    "Halo, selamat pagi",
+    "Cek resi FDE123456789",
+    "Paket saya rusak, kardusnya basah",
+    "Kiriman saya terlambat sudah seminggu belum sampai",
+    "Rating 5 bintang, pelayanan bagus",
+    "Bisa kirim ke luar negeri?",
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmark pipeline generate_response melalui LLM router (default: provider stub, offline)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=120, help="Jumlah pesan (default: 120)")
+        parser.add_argument(
+            '--provider', choices=sorted(llm_router.PROVIDERS), default='stub',
+            help="Provider LLM (default: stub)",
+        )
+        parser.add_argument('--latency-ms', type=int, help="Latency provider stub per 500 token")
+
+    def handle(self, *args, **options):
+        provider_class = llm_router.PROVIDERS[options['provider']]
+        provider = (
+            provider_class(options['latency_ms'])
+            if provider_class is llm_router.StubProvider else provider_class()
+        )
+        # Router baru khusus benchmark supaya statistik tidak tercampur
+        llm_router._router = llm_router.ModelRouter(provider)
+
+        service = DeliveryAIService()
+        latencies = defaultdict(list)
+        started = time.monotonic()
+        for i in range(options['requests']):
+            message = SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]
+            intent = service.detect_intent(message)
+            request_started = time.monotonic()
+            service.generate_response(message)
+            latencies[intent].append(time.monotonic() - request_started)
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{options['requests']} pesan via {provider.name} dalam {elapsed:.2f}s "
+            f"({options['requests'] / elapsed:,.1f} pesan/detik)"
+        ))
+        self.stdout.write(f"{'intent':<10} {'n':>5} {'p50 ms':>9} {'max ms':>9}  model")
+        for intent, values in sorted(latencies.items()):
+            route = llm_router._router.candidates(intent)[0]
+            self.stdout.write(
+                f"{intent:<10} {len(values):>5} {statistics.median(values) * 1000:>9.1f} "
+                f"{max(values) * 1000:>9.1f}  {route['model']} ({route['max_tokens']} token)"
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nStatistik model:"))
+        for model, stats in sorted(llm_router._router.stats().items()):
+            self.stdout.write(f"  {model}: {stats}")
@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+GROUP = 'scaling_check'
+
+
+def _worker(index, count, timeout, cache_key, results):
+    """Proses worker terpisah: setup Django sendiri lalu terima pesan dari group"""
+    import django
+    django.setup()
+
+    from channels.layers import get_channel_layer
+    from django.core.cache import cache
+
+    results.put(('cache', index, cache.get(cache_key)))
+
+    async def receive():
+        layer = get_channel_layer()
+        channel = await layer.new_channel()
+        await layer.group_add(GROUP, channel)
+        results.put(('ready', index, os.getpid()))
+
+        latencies = []
+        try:
+            while len(latencies) < count:
+                message = await asyncio.wait_for(layer.receive(channel), timeout)
+                latencies.append(time.time() - message['sent_at'])
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await layer.group_discard(GROUP, channel)
+        return latencies
+
+    results.put(('done', index, asyncio.run(receive())))
+
+
+class Command(BaseCommand):
+    help = "Uji integrasi multi-proses: cache bersama dan pengiriman group channel layer antar worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Jumlah proses worker (default: 4)")
+        parser.add_argument('--messages', type=int, default=100, help="Jumlah pesan group_send (default: 100)")
+        parser.add_argument('--timeout', type=float, default=10.0, help="Timeout per tahap dalam detik")
+
+    def handle(self, *args, **options):
+        from asgiref.sync import async_to_sync
+        from channels.layers import InMemoryChannelLayer, get_channel_layer
+        from django.core.cache import caches
+        from django.core.cache.backends.locmem import LocMemCache
+
+        workers = options['workers']
+        count = options['messages']
+        timeout = options['timeout']
+
+        # django.core.cache.cache adalah ConnectionProxy, isinstance harus ke backend aslinya
+        cache = caches['default']
+        layer = get_channel_layer()
+        if isinstance(layer, InMemoryChannelLayer) or isinstance(cache, LocMemCache):
+            raise CommandError(
+                "Channel layer/cache masih per proses. Set REDIS_URL untuk mode multi-worker."
+            )
+
+        cache_key = f"scaling_check:{uuid.uuid4().hex}"
+        token = uuid.uuid4().hex
+        try:
+            cache.set(cache_key, token, 60)
+        except Exception as e:
+            raise CommandError(f"Tidak bisa terhubung ke cache bersama: {e}")
+
+        ctx = multiprocessing.get_context('spawn')
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(target=_worker, args=(i, count, timeout, cache_key, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            cache_ok = 0
+            ready = 0
+            while ready < workers:
+                kind, index, value = results.get(timeout=timeout + 30)
+                if kind == 'cache':
+                    cache_ok += value == token
+                elif kind == 'ready':
+                    ready += 1
+                    self.stdout.write(f"Worker {index} siap (pid {value})")
+
+            send = async_to_sync(layer.group_send)
+            for seq in range(count):
+                send(GROUP, {'type': 'scaling.check', 'seq': seq, 'sent_at': time.time()})
+
+            received = {}
+            while len(received) < workers:
+                kind, index, value = results.get(timeout=timeout + 30)
+                received[index] = value
+        except queue.Empty:
+            raise CommandError("Worker tidak merespons sebelum timeout")
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            cache.delete(cache_key)
+
+        latencies = sorted(latency for values in received.values() for latency in values)
+        delivered = len(latencies)
+        expected = workers * count
+
+        self.stdout.write(f"Cache bersama: {cache_ok}/{workers} worker membaca nilai yang sama")
+        self.stdout.write(f"Pesan terkirim: {delivered}/{expected}")
+        if latencies:
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(
+                f"Latency: p50 {statistics.median(latencies) * 1000:.1f}ms, "
+                f"p95 {p95 * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms"
+            )
+
+        if cache_ok != workers or delivered != expected:
+            raise CommandError("❌ Pengiriman antar proses tidak lengkap")
+        self.stdout.write(self.style.SUCCESS("✅ Mode multi-worker berfungsi"))
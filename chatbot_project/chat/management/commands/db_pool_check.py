@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+
+class Command(BaseCommand):
+    help = "Uji beban koneksi database dari banyak thread dan tampilkan metrics pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=20, help="Jumlah thread (default: 20)")
+        parser.add_argument('--queries', type=int, default=50, help="Query per thread (default: 50)")
+        parser.add_argument(
+            '--hold', type=float, default=0.01,
+            help="Lama setiap query menahan koneksi dalam detik, via pg_sleep (default: 0.01)",
+        )
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        queries = options['queries']
+        hold = options['hold']
+
+        if connection.vendor != 'postgresql':
+            raise CommandError("db_pool_check membutuhkan database PostgreSQL")
+
+        errors = []
+        latencies = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(queries):
+                started = time.monotonic()
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT pg_sleep(%s)', [hold])
+                except OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+                finally:
+                    # Sama seperti akhir request: koneksi dilepas (kembali ke pool)
+                    connection.close()
+                with lock:
+                    latencies.append(time.monotonic() - started)
+
+        started = time.monotonic()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        latencies.sort()
+        total = threads * queries
+        self.stdout.write(
+            f"Mode: {settings.DB_POOL_MODE}, {total} query dari {threads} thread "
+            f"dalam {elapsed:.2f}s ({total / elapsed:,.0f} query/detik)"
+        )
+        self.stdout.write(
+            f"Latency checkout+query: p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+            f"max {latencies[-1] * 1000:.1f}ms, error {len(errors)}"
+        )
+        if errors:
+            self.stdout.write(self.style.WARNING(f"Contoh error: {errors[0]}"))
+
+        if settings.DB_POOL_MODE == 'pool':
+            from chatbot_project.db_pool.base import pool_metrics
+            for metrics in pool_metrics():
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\nPool '{metrics['alias']}':"))
+                for key, value in metrics.items():
+                    if key != 'alias':
+                        self.stdout.write(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
@@ -0,0 +1,40 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.exports import iter_conversation_records, iter_gzip, iter_ndjson, parse_export_range
+
+
+class Command(BaseCommand):
+    help = "Export ChatSession & Message dalam rentang tanggal ke NDJSON secara streaming"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help="Tanggal/waktu awal (YYYY-MM-DD atau ISO 8601)")
+        parser.add_argument('--end', required=True, help="Tanggal/waktu akhir, tanggal saja = inklusif")
+        parser.add_argument('--output', '-o', default='-', help="File output (default: stdout)")
+        parser.add_argument('--gzip', action='store_true', help="Kompres output dengan gzip")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Baris per fetch cursor (default: 2000)")
+
+    def handle(self, *args, **options):
+        try:
+            start, end = parse_export_range(options['start'], options['end'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        chunks = iter_ndjson(iter_conversation_records(start, end, options['chunk_size']))
+        if options['gzip']:
+            chunks = iter_gzip(chunks)
+
+        started = time.monotonic()
+        written = 0
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        self.stderr.write(f"✅ {written:,} bytes ditulis dalam {time.monotonic() - started:.1f}s")
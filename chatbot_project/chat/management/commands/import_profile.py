@@ -0,0 +1,96 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Dijalankan di proses baru agar modul yang sudah ter-import tidak ikut terhitung
+STARTUP_SCRIPT = """
+import sys
+import time
+started = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+ready = time.perf_counter()
+sys.stderr.write("STARTUP READY\\n")
+sys.stderr.flush()
+first_request = 0.0
+if {first_request!r}:
+    from django.test import Client
+    Client().get({path!r})
+    first_request = time.perf_counter() - ready
+print("STARTUP %.6f %.6f" % (ready - started, first_request))
+"""
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)$')
+
+
+class Command(BaseCommand):
+    help = "Laporan waktu import per modul saat cold start (seperti -X importtime, diagregasi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help="Jumlah baris per tabel (default: 20)")
+        parser.add_argument(
+            '--first-request', metavar='PATH', nargs='?', const='/',
+            help="Ukur juga request pertama ke PATH (default: /) setelah startup",
+        )
+
+    def handle(self, *args, **options):
+        top = options['top']
+        path = options['first_request']
+
+        env = os.environ.copy()
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(settings.BASE_DIR), env.get('PYTHONPATH')]))
+        script = STARTUP_SCRIPT.format(first_request=path is not None, path=path or '/')
+
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, env=env, cwd=str(settings.BASE_DIR),
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup gagal:\n{result.stderr[-2000:]}")
+
+        modules = []
+        for line in result.stderr.splitlines():
+            if line == 'STARTUP READY':
+                # Import setelah titik ini milik request pertama (django.test dll)
+                break
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, name = match.groups()
+                modules.append((name, int(self_us), int(cumulative_us)))
+
+        packages = defaultdict(lambda: [0, 0])
+        for name, self_us, _ in modules:
+            package = packages[name.split('.')[0]]
+            package[0] += self_us
+            package[1] += 1
+
+        startup, first_request = next(
+            (map(float, line.split()[1:]) for line in result.stdout.splitlines() if line.startswith('STARTUP ')),
+            (0.0, 0.0),
+        )
+        total_self = sum(self_us for _, self_us, _ in modules)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Cold start: {startup * 1000:.1f}ms (django.setup + URLconf), "
+            f"{len(modules)} modul, total import {total_self / 1000:.1f}ms"
+        ))
+        if path is not None:
+            self.stdout.write(f"Request pertama ke {path}: {first_request * 1000:.1f}ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nPer paket (self time):"))
+        self.stdout.write(f"{'self ms':>10} {'modul':>10}  paket")
+        for name, (self_us, count) in sorted(packages.items(), key=lambda item: -item[1][0])[:top]:
+            self.stdout.write(f"{self_us / 1000:>10.1f} {count:>10}  {name}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nModul paling lambat (self time):"))
+        self.stdout.write(f"{'self ms':>10} {'cumul ms':>10}  modul")
+        for name, self_us, cumulative_us in sorted(modules, key=lambda item: -item[1])[:top]:
+            self.stdout.write(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}  {name}")
@@ -0,0 +1,226 @@
+import csv
+import json
+import os
+import time
+
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from chat.ai_service import delivery_cache_key
+from chat.models import DeliveryTracking
+from chat.notifications import broadcast_subscribed_changes
+
+# Kolom yang diisi dari feed kurir. `rating` sengaja tidak ikut supaya
+# rating dari pelanggan tidak tertimpa saat upsert.
+FEED_FIELDS = [
+    'status',  # harus tetap kolom pertama, dipakai untuk deteksi perubahan status
+    'current_location',
+    'delivery_date',
+    'recipient_name',
+    'recipient_phone',
+    'issues',
+]
+
+VALID_STATUSES = {choice for choice, _ in DeliveryTracking.STATUS_CHOICES}
+
+
+class Command(BaseCommand):
+    help = "Import status pengiriman dari feed kurir (CSV/JSONL) secara streaming dengan upsert batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File feed kurir (.csv atau .jsonl)")
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help="Format input (default: berdasarkan ekstensi file)",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Jumlah baris per batch upsert (default: 5000)",
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help="File checkpoint untuk melanjutkan import yang terputus",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        batch_size = options['batch_size']
+        checkpoint_path = options['checkpoint']
+
+        if not os.path.exists(path):
+            raise CommandError(f"File tidak ditemukan: {path}")
+        if batch_size < 1:
+            raise CommandError("--batch-size harus lebih dari 0")
+
+        # InMemoryChannelLayer hanya hidup di proses ini, group_send tidak akan
+        # sampai ke consumer di worker daphne. Perlu channel layer bersama (REDIS_URL).
+        self.broadcast = not isinstance(get_channel_layer(), InMemoryChannelLayer)
+        if not self.broadcast:
+            self.stderr.write(self.style.WARNING(
+                "⚠️ Channel layer masih in-memory: perubahan status tidak akan di-push ke "
+                "WebSocket. Set REDIS_URL untuk mengaktifkan push dari import."
+            ))
+
+        state = self.load_checkpoint(checkpoint_path, path)
+        if state['offset']:
+            self.stdout.write(
+                f"Melanjutkan dari byte {state['offset']} ({state['rows']} baris sudah diproses)"
+            )
+
+        stats = {'rows': 0, 'changed': 0, 'skipped': 0}
+        started = time.monotonic()
+        batch = {}
+
+        with open(path, 'rb') as fh:
+            for record, offset in self.iter_records(fh, fmt, state['offset']):
+                row = self.clean_record(record)
+                if row is None:
+                    stats['skipped'] += 1
+                else:
+                    # Update terakhir untuk nomor resi yang sama di batch ini yang menang
+                    batch[row['tracking_number']] = row
+                stats['rows'] += 1
+
+                if len(batch) >= batch_size:
+                    stats['changed'] += self.flush(batch)
+                    batch = {}
+                    self.save_checkpoint(checkpoint_path, path, offset, state['rows'] + stats['rows'])
+                    self.report(stats, started)
+
+            if batch:
+                stats['changed'] += self.flush(batch)
+            self.save_checkpoint(checkpoint_path, path, fh.tell(), state['rows'] + stats['rows'])
+
+        elapsed = time.monotonic() - started
+        rate = stats['rows'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Selesai: {stats['rows']} baris, {stats['changed']} berubah, "
+            f"{stats['skipped']} dilewati dalam {elapsed:.1f}s ({rate:,.0f} baris/detik)"
+        ))
+
+    def iter_records(self, fh, fmt, offset):
+        """Yield (record, byte offset setelah record) tanpa memuat seluruh file"""
+        position = [offset]
+
+        def lines():
+            for raw in fh:
+                position[0] += len(raw)
+                yield raw.decode('utf-8')
+
+        if fmt == 'jsonl':
+            fh.seek(offset)
+            for line in lines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Baris rusak dihitung sebagai dilewati oleh clean_record
+                    record = None
+                yield record, position[0]
+            return
+
+        # CSV: header selalu dibaca dari awal file, lalu lompat ke checkpoint
+        header = next(csv.reader([fh.readline().decode('utf-8-sig')]), [])
+        if offset:
+            fh.seek(offset)
+        else:
+            position[0] = fh.tell()
+        for values in csv.reader(lines()):
+            if values:
+                yield dict(zip(header, values)), position[0]
+
+    def clean_record(self, record):
+        """Normalisasi satu record feed, None jika tidak valid"""
+        if not isinstance(record, dict):
+            return None
+
+        def text(field):
+            # Nilai JSONL bisa berupa angka/null, bukan hanya string
+            value = record.get(field)
+            return '' if value is None else str(value)
+
+        tracking_number = text('tracking_number').strip().upper()
+        status = text('status').strip()
+        if not tracking_number or status not in VALID_STATUSES:
+            return None
+
+        delivery_date = text('delivery_date') or None
+        if delivery_date:
+            try:
+                delivery_date = parse_datetime(delivery_date)
+            except ValueError:
+                # Format benar tapi nilai di luar rentang, mis. bulan 13
+                return None
+            if delivery_date and timezone.is_naive(delivery_date):
+                delivery_date = timezone.make_aware(delivery_date)
+
+        return {
+            'tracking_number': tracking_number,
+            'status': status,
+            'current_location': text('current_location')[:200],
+            'delivery_date': delivery_date,
+            'recipient_name': text('recipient_name')[:100],
+            'recipient_phone': text('recipient_phone')[:20],
+            'issues': text('issues'),
+        }
+
+    def flush(self, batch):
+        """Upsert satu batch, hanya menulis baris yang benar-benar berubah"""
+        existing = {
+            values[0]: values[1:]
+            for values in DeliveryTracking.objects.filter(
+                tracking_number__in=list(batch)
+            ).values_list('tracking_number', *FEED_FIELDS).iterator()
+        }
+
+        changed = [
+            row for tracking_number, row in batch.items()
+            if existing.get(tracking_number) != tuple(row[field] for field in FEED_FIELDS)
+        ]
+        if not changed:
+            return 0
+
+        DeliveryTracking.objects.bulk_create(
+            [DeliveryTracking(**row) for row in changed],
+            update_conflicts=True,
+            unique_fields=['tracking_number'],
+            update_fields=FEED_FIELDS,
+        )
+        cache.delete_many([delivery_cache_key(row['tracking_number']) for row in changed])
+
+        # bulk_create tidak memicu post_save, jadi push update status dilakukan di sini
+        if self.broadcast:
+            broadcast_subscribed_changes(
+                row for row in changed
+                if row['tracking_number'] not in existing
+                or existing[row['tracking_number']][0] != row['status']
+            )
+        return len(changed)
+
+    def report(self, stats, started):
+        elapsed = time.monotonic() - started
+        rate = stats['rows'] / elapsed if elapsed else 0
+        self.stdout.write(f"📦 {stats['rows']} baris ({rate:,.0f} baris/detik), {stats['changed']} berubah")
+
+    def load_checkpoint(self, checkpoint_path, source):
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return {'offset': 0, 'rows': 0}
+        with open(checkpoint_path) as fh:
+            state = json.load(fh)
+        if state.get('source') != os.path.abspath(source):
+            raise CommandError(f"Checkpoint {checkpoint_path} milik file lain: {state.get('source')}")
+        return state
+
+    def save_checkpoint(self, checkpoint_path, source, offset, rows):
+        if not checkpoint_path:
+            return
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as fh:
+            json.dump({'source': os.path.abspath(source), 'offset': offset, 'rows': rows}, fh)
+        os.replace(tmp_path, checkpoint_path)
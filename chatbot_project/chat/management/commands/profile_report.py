@@ -0,0 +1,77 @@
+import collections
+import glob
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Gabungkan profil request dari PROFILER_DIR menjadi collapsed stack per endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', help="Hanya endpoint ini (url name)")
+        parser.add_argument(
+            '--output', '-o',
+            help="Folder output <endpoint>.folded (input flamegraph.pl / speedscope)",
+        )
+        parser.add_argument('--top', type=int, default=15, help="Jumlah frame teratas per endpoint (default: 15)")
+        parser.add_argument('--clear', action='store_true', help="Hapus file profil setelah diproses")
+
+    def handle(self, *args, **options):
+        pattern = f"{options['endpoint'] or '*'}.*.folded"
+        paths = sorted(glob.glob(os.path.join(settings.PROFILER_DIR, pattern)))
+        if not paths:
+            raise CommandError(f"Tidak ada profil di {settings.PROFILER_DIR}")
+
+        endpoints = collections.defaultdict(lambda: {
+            'stacks': collections.Counter(), 'requests': 0, 'duration_ms': 0.0,
+        })
+        for path in paths:
+            endpoint = os.path.basename(path).split('.', 1)[0]
+            report = endpoints[endpoint]
+            report['requests'] += 1
+            with open(path) as fh:
+                for line in fh:
+                    line = line.rstrip('\n')
+                    if line.startswith('# duration_ms '):
+                        report['duration_ms'] += float(line.split()[-1])
+                    elif line:
+                        stack, count = line.rsplit(' ', 1)
+                        report['stacks'][stack] += int(count)
+
+        if options['output']:
+            os.makedirs(options['output'], exist_ok=True)
+
+        for endpoint, report in sorted(endpoints.items()):
+            stacks = report['stacks']
+            total = sum(stacks.values())
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{endpoint}: {report['requests']} request, {total} sampel, "
+                f"rata-rata {report['duration_ms'] / report['requests']:.1f}ms"
+            ))
+
+            self_time = collections.Counter()
+            inclusive = collections.Counter()
+            for stack, count in stacks.items():
+                frames = stack.split(';')
+                self_time[frames[-1]] += count
+                for frame in set(frames):
+                    inclusive[frame] += count
+
+            self.stdout.write(f"{'self %':>8} {'total %':>8}  frame")
+            for frame, count in self_time.most_common(options['top']):
+                self.stdout.write(
+                    f"{count / total * 100:>8.1f} {inclusive[frame] / total * 100:>8.1f}  {frame}"
+                )
+
+            if options['output']:
+                path = os.path.join(options['output'], f"{endpoint}.folded")
+                with open(path, 'w') as fh:
+                    for stack, count in stacks.most_common():
+                        fh.write(f"{stack} {count}\n")
+                self.stdout.write(f"→ {path}")
+
+        if options['clear']:
+            for path in paths:
+                os.remove(path)
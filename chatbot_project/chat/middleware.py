@@ -0,0 +1,74 @@
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .log import request_id_var, stage_timings_var
+from .profiling import get_sampler, write_profile
+
+logger = logging.getLogger(__name__)
+
+_ENDPOINT_UNSAFE = re.compile(r'[^A-Za-z0-9_-]+')
+_REQUEST_ID_SAFE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class RequestContextMiddleware:
+    """Set request id (dari X-Request-ID atau baru) dan stage timings untuk logging"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get('X-Request-ID', '')
+        if not _REQUEST_ID_SAFE.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        request_id_token = request_id_var.set(request_id)
+        timings_token = stage_timings_var.set({})
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(request_id_token)
+            stage_timings_var.reset(timings_token)
+        response['X-Request-ID'] = request_id
+        return response
+
+
+class SamplingProfilerMiddleware:
+    """Profil sebagian kecil request (PROFILER_SAMPLE_RATE) dengan stack sampling"""
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        sampler = get_sampler()
+        thread_id = threading.get_ident()
+        started = time.monotonic()
+        sampler.start(thread_id)
+        try:
+            return self.get_response(request)
+        finally:
+            stacks = sampler.stop(thread_id)
+            if stacks:
+                try:
+                    write_profile(self.endpoint_name(request), stacks, time.monotonic() - started)
+                except OSError as e:
+                    logger.error("Failed to write profile: %s", e, extra={'event': 'profile_write_error'})
+
+    @staticmethod
+    def endpoint_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name:
+            return match.url_name
+        return _ENDPOINT_UNSAFE.sub('_', request.path).strip('_') or 'root'
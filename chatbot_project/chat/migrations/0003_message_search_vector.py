@@ -0,0 +1,83 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+# Harus sama dengan chat.search.SEARCH_CONFIG
+SEARCH_CONFIG = "simple"
+
+BACKFILL_BATCH = 50000
+
+CREATE_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION chat_message_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.content, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS chat_message_search_vector_trigger ON chat_message;
+CREATE TRIGGER chat_message_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF content ON chat_message
+    FOR EACH ROW EXECUTE FUNCTION chat_message_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS chat_message_search_vector_trigger ON chat_message;
+DROP FUNCTION IF EXISTS chat_message_search_vector_update();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_TRIGGER)
+
+
+def backfill_search_vector(apps, schema_editor):
+    """Isi search_vector untuk pesan lama per rentang id agar tidak mengunci tabel lama"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT coalesce(max(id), 0) FROM chat_message")
+        max_id = cursor.fetchone()[0]
+        for start in range(0, max_id + 1, BACKFILL_BATCH):
+            cursor.execute(
+                f"UPDATE chat_message SET search_vector = to_tsvector('{SEARCH_CONFIG}', content) "
+                "WHERE id >= %s AND id < %s AND search_vector IS NULL",
+                [start, start + BACKFILL_BATCH],
+            )
+
+
+class Migration(migrations.Migration):
+
+    # Backfill per batch di-commit sendiri-sendiri, dan CREATE INDEX
+    # CONCURRENTLY tidak bisa berjalan di dalam transaksi
+    atomic = False
+
+    dependencies = [
+        ("chat", "0002_trackingsubscription"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+        # Tanpa CONCURRENTLY, build GIN di tabel besar memblokir INSERT pesan baru
+        AddIndexConcurrently(
+            model_name="message",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="chat_message_search_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.9 on 2026-10-19 00:06
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY tidak bisa berjalan di dalam transaksi
+    atomic = False
+
+    dependencies = [
+        ("chat", "0003_message_search_vector"),
+    ]
+
+    operations = [
+        # AlterField(db_index=True) membuat index tanpa CONCURRENTLY dan mengunci
+        # tabel terbesar dari penulisan selama build. State tetap AlterField/AddIndex,
+        # database memakai AddIndexConcurrently dengan nama yang sama seperti yang
+        # dihasilkan Django untuk db_index.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chatsession",
+                    name="created_at",
+                    field=models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+                migrations.AlterField(
+                    model_name="message",
+                    name="timestamp",
+                    field=models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+            ],
+            database_operations=[
+                AddIndexConcurrently(
+                    model_name="chatsession",
+                    index=models.Index(
+                        fields=["created_at"], name="chat_chatsession_created_at_91428a6b"
+                    ),
+                ),
+                AddIndexConcurrently(
+                    model_name="message",
+                    index=models.Index(
+                        fields=["timestamp"], name="chat_message_timestamp_6bd10941"
+                    ),
+                ),
+            ],
+        ),
+        AddIndexConcurrently(
+            model_name="message",
+            index=models.Index(fields=["session", "timestamp"], name="chat_message_session_ts"),
+        ),
+    ]
@@ -1,10 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 class ChatSession(models.Model):
     session_id = models.CharField(max_length=100, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     is_active = models.BooleanField(default=True)
 
     def __str__(self):
@@ -14,10 +16,17 @@ class Message(models.Model):
     session = models.ForeignKey(ChatSession, on_delete=models.CASCADE)
     content = models.TextField()
     is_user = models.BooleanField(default=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Diisi trigger database saat insert/update content (lihat migration 0003)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='chat_message_search_gin'),
+            # Riwayat chat per sesi: filter session lalu urut timestamp
+            models.Index(fields=['session', 'timestamp'], name='chat_message_session_ts'),
+        ]
 
     def __str__(self):
         sender = "User" if self.is_user else "Bot"
@@ -44,5 +53,24 @@ class DeliveryTracking(models.Model):
     issues = models.TextField(blank=True)
     rating = models.IntegerField(null=True, blank=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan status awal untuk mendeteksi perubahan status saat save()
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def __str__(self):
+        return f"{self.tracking_number} - {self.get_status_display()}"
+
+class TrackingSubscription(models.Model):
+    """Nomor resi yang ditanyakan sebuah sesi chat, untuk push update status"""
+    session = models.ForeignKey(ChatSession, on_delete=models.CASCADE, related_name='subscriptions')
+    tracking_number = models.CharField(max_length=50, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [('session', 'tracking_number')]
+
     def __str__(self):
-        return f"{self.tracking_number} - {self.get_status_display()}"
\ No newline at end of file
+        return f"{self.session.session_id} -> {self.tracking_number}"
\ No newline at end of file
@@ -0,0 +1,86 @@
+import logging
+import re
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from .models import DeliveryTracking, TrackingSubscription
+
+logger = logging.getLogger(__name__)
+
+# Nama group channel layer hanya boleh berisi ASCII alfanumerik, '-', '_' atau '.'
+_GROUP_UNSAFE = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def tracking_group_name(tracking_number):
+    """Group channel layer untuk satu nomor resi"""
+    return f"tracking_{_GROUP_UNSAFE.sub('', tracking_number)}"[:99]
+
+
+def session_group_name(session_id):
+    """Group channel layer untuk satu sesi chat"""
+    return f"session_{_GROUP_UNSAFE.sub('', session_id)}"[:99]
+
+
+def _group_send(group, message):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(group, message)
+    except Exception as e:
+        # Push update bersifat best-effort, jangan gagalkan request/import
+        logger.error("Channel layer error for group %s: %s", group, e,
+                     extra={'event': 'channel_layer_error'})
+
+
+def subscribe_session(session, tracking_number):
+    """Daftarkan sesi ke update status sebuah nomor resi"""
+    subscription, created = TrackingSubscription.objects.get_or_create(
+        session=session,
+        tracking_number=tracking_number,
+    )
+    if created:
+        # Consumer WebSocket yang sedang terhubung ikut join ke group resi ini
+        _group_send(session_group_name(session.session_id), {
+            'type': 'tracking.subscribe',
+            'tracking_number': tracking_number,
+        })
+    return subscription
+
+
+def build_status_message(tracking_number, status, current_location):
+    status_display = dict(DeliveryTracking.STATUS_CHOICES).get(status, status)
+    return f"""🔔 **Update Status Paket**
+
+📦 Nomor Resi: **{tracking_number}**
+📊 Status: {status_display}
+📍 Lokasi Saat Ini: {current_location}"""
+
+
+def broadcast_status_change(tracking_number, status, current_location):
+    """Kirim perubahan status ke semua sesi yang berlangganan nomor resi ini"""
+    _group_send(tracking_group_name(tracking_number), {
+        'type': 'tracking.update',
+        'tracking_number': tracking_number,
+        'status': status,
+        'current_location': current_location,
+        'message': build_status_message(tracking_number, status, current_location),
+    })
+
+
+def broadcast_subscribed_changes(rows):
+    """Broadcast perubahan status hanya untuk nomor resi yang punya subscriber"""
+    rows = {row['tracking_number']: row for row in rows}
+    if not rows:
+        return 0
+
+    subscribed = set(
+        TrackingSubscription.objects.filter(tracking_number__in=list(rows))
+        .values_list('tracking_number', flat=True)
+        .distinct()
+    )
+    for tracking_number in subscribed:
+        row = rows[tracking_number]
+        broadcast_status_change(tracking_number, row['status'], row['current_location'])
+    return len(subscribed)
@@ -0,0 +1,95 @@
+import collections
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+
+class StackSampler:
+    """Satu thread per proses yang mengambil sampel stack dari thread yang terdaftar.
+
+    Overhead hanya dibayar request yang sedang diprofil; saat tidak ada thread
+    terdaftar, thread sampler tidur menunggu event.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._active = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._active[thread_id] = collections.Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, thread_id):
+        """Berhenti memprofil thread, return Counter {stack: jumlah sampel}"""
+        with self._lock:
+            return self._active.pop(thread_id, collections.Counter())
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wakeup.clear()
+            if not active:
+                self._wakeup.wait()
+                continue
+
+            frames = sys._current_frames()
+            for thread_id in active:
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own_id:
+                    continue
+                stack = self.collapse(frame)
+                with self._lock:
+                    counter = self._active.get(thread_id)
+                    if counter is not None:
+                        counter[stack] += 1
+            del frames
+            time.sleep(self.interval)
+
+    @staticmethod
+    def collapse(frame):
+        """Stack dalam format collapsed (root;...;leaf), satu frame = modul:fungsi"""
+        names = []
+        while frame is not None:
+            names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = StackSampler(settings.PROFILER_INTERVAL_MS / 1000)
+        return _sampler
+
+
+_sequence = iter(range(sys.maxsize))
+
+
+def write_profile(endpoint, stacks, duration):
+    """Simpan profil satu request sebagai file .folded di PROFILER_DIR"""
+    os.makedirs(settings.PROFILER_DIR, exist_ok=True)
+    filename = f"{endpoint}.{int(time.time() * 1000)}.{os.getpid()}.{next(_sequence)}.folded"
+    path = os.path.join(settings.PROFILER_DIR, filename)
+    with open(path, 'w') as fh:
+        fh.write(f"# duration_ms {duration * 1000:.1f}\n")
+        for stack, count in stacks.items():
+            fh.write(f"{stack} {count}\n")
+    return path
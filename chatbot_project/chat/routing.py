@@ -1,7 +1,9 @@
 # chat/routing.py
 from django.urls import re_path
 
+from . import consumers
+
 websocket_urlpatterns = [
-    # WebSocket routes untuk future features
-    # Saat ini kosong karena kita pakai HTTP requests
-]
\ No newline at end of file
+    # Push update status paket untuk nomor resi yang ditanyakan sesi ini
+    re_path(r'^ws/chat/(?P<session_id>[\w-]+)/$', consumers.TrackingConsumer.as_asgi()),
+]
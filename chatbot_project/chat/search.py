@@ -0,0 +1,32 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+from .models import Message
+
+# Konfigurasi text search; harus sama dengan trigger di migration 0003.
+# 'simple' dipakai karena tidak ada stemmer bahasa Indonesia di semua versi PostgreSQL.
+SEARCH_CONFIG = 'simple'
+
+
+def build_search_query(text):
+    """SearchQuery dengan sintaks ala web search: "frasa", OR, -kata"""
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def search_messages(text, page=1, page_size=20):
+    """Cari pesan lewat GIN index, urut relevansi.
+
+    Return (results, has_next). Tidak memakai COUNT(*) supaya tetap cepat
+    untuk kata yang muncul di jutaan pesan.
+    """
+    query = build_search_query(text)
+    queryset = (
+        Message.objects.filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .select_related('session')
+        .defer('search_vector')
+        .order_by('-rank', '-timestamp')
+    )
+    offset = (page - 1) * page_size
+    results = list(queryset[offset:offset + page_size + 1])
+    return results[:page_size], len(results) > page_size
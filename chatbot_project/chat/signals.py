@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import DeliveryTracking
+from .notifications import broadcast_status_change
+
+
+@receiver(post_save, sender=DeliveryTracking)
+def delivery_status_changed(sender, instance, created, **kwargs):
+    """Fan-out perubahan status DeliveryTracking ke subscriber WebSocket"""
+    if not created and getattr(instance, '_loaded_status', None) == instance.status:
+        return
+
+    instance._loaded_status = instance.status
+    transaction.on_commit(lambda: broadcast_status_change(
+        instance.tracking_number, instance.status, instance.current_location
+    ))
@@ -1,3 +1,124 @@
-from django.test import TestCase
+import os
+from datetime import datetime
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from .ai_service import INTENT_KEYWORDS, DeliveryAIService
+from .exports import parse_export_range
+from .llm_router import DEFAULT_ROUTES
+from .tracking_index import SortedBlob, TrackingIndex
+
+
+class ParseExportRangeTests(SimpleTestCase):
+    def aware(self, *args):
+        return timezone.make_aware(datetime(*args))
+
+    def test_date_only_end_is_inclusive(self):
+        start, end = parse_export_range('2026-10-01', '2026-10-31')
+        self.assertEqual(start, self.aware(2026, 10, 1))
+        self.assertEqual(end, self.aware(2026, 11, 1))
+
+    def test_same_day_covers_whole_day(self):
+        start, end = parse_export_range('2026-10-19', '2026-10-19')
+        self.assertEqual(start, self.aware(2026, 10, 19))
+        self.assertEqual(end, self.aware(2026, 10, 20))
+
+    def test_datetime_end_is_exact(self):
+        start, end = parse_export_range('2026-10-19', '2026-10-19T12:30:00')
+        self.assertEqual(end, self.aware(2026, 10, 19, 12, 30))
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            parse_export_range('kemarin', '2026-10-19')
+        with self.assertRaises(ValueError):
+            parse_export_range('2026-10-20', '2026-10-19')
+
+
+class SortedBlobTests(SimpleTestCase):
+    def test_contains_and_iter(self):
+        numbers = sorted([b'FDE001', b'FDE005', b'JNE123', b'SPX999'])
+        blob = SortedBlob(6, numbers)
+        self.assertEqual(len(blob.data), 24)
+        self.assertEqual(list(blob), numbers)
+        for number in numbers:
+            self.assertIn(number, blob)
+        for missing in (b'AAA000', b'FDE002', b'ZZZ999'):
+            self.assertNotIn(missing, blob)
+
+    def test_empty(self):
+        self.assertNotIn(b'FDE001', SortedBlob(6, []))
+
+
+class TrackingIndexTests(SimpleTestCase):
+    def setUp(self):
+        # _load tidak menyentuh database; refresh berikutnya baru setelah TRACKING_INDEX_REFRESH
+        self.index = TrackingIndex()
+        self.index._load(enumerate(['FDE123456789', 'FDE123456780', 'JNE0001'], start=1))
+
+    def test_edits_cover_all_operations(self):
+        edits = set(self.index._edits('FDE12345678'))
+        self.assertIn('FDE123456789', edits)  # sisip
+        edits = set(self.index._edits('FDE1234567899'))
+        self.assertIn('FDE123456789', edits)  # hapus
+        edits = set(self.index._edits('FDE123456798'))
+        self.assertIn('FDE123456789', edits)  # tukar
+        edits = set(self.index._edits('FDE123456781'))
+        self.assertIn('FDE123456789', edits)  # ganti
+
+    def test_edits_only_use_known_position_chars(self):
+        # Posisi pertama resi 12 karakter hanya pernah berisi 'F'
+        substitutions = {edit for edit in self.index._edits('XDE123456789') if len(edit) == 12}
+        self.assertIn('FDE123456789', substitutions)
+        self.assertNotIn('JDE123456789', substitutions)
+
+    def test_suggest(self):
+        self.assertEqual(self.index.suggest('JNE001'), ['JNE0001'])
+        self.assertCountEqual(self.index.suggest('FDE123456781'), ['FDE123456789', 'FDE123456780'])
+        self.assertEqual(len(self.index.suggest('FDE123456781', limit=1)), 1)
+        self.assertEqual(self.index.suggest('XYZ'), [])
+
+    def test_suggest_excludes_exact_match(self):
+        self.assertEqual(self.index.suggest('FDE123456789'), ['FDE123456780'])
+
+
+class DetectIntentTests(SimpleTestCase):
+    def test_routing_table(self):
+        cases = {
+            "Halo, selamat pagi": 'greeting',
+            "Selamat malam kak": 'greeting',
+            "Cek resi FDE123456789": 'tracking',
+            "Paket saya rusak, kardusnya basah": 'damaged',
+            "Barangnya beda dengan pesanan": 'damaged',
+            "Kiriman saya terlambat sudah seminggu belum sampai": 'delayed',
+            "Kok lama banget": 'delayed',
+            "Rating 5 bintang, pelayanan bagus": 'rating',
+            "Bisa kirim ke luar negeri?": 'general',
+        }
+        for message, intent in cases.items():
+            with self.subTest(message=message):
+                self.assertEqual(DeliveryAIService.detect_intent(message), intent)
+
+    def test_keywords_match_whole_words_only(self):
+        # 'lama' di dalam "selamat", 'beda' di dalam "berbeda"
+        self.assertEqual(DeliveryAIService.detect_intent("Selamat siang"), 'greeting')
+        self.assertEqual(DeliveryAIService.detect_intent("warnanya berbeda sedikit"), 'general')
+
+    def test_every_intent_has_route(self):
+        for intent, _ in INTENT_KEYWORDS:
+            self.assertIn(intent, DEFAULT_ROUTES)
+        self.assertIn('general', DEFAULT_ROUTES)
+
+
+@skipUnless(os.getenv('REDIS_URL'), "Butuh REDIS_URL (cache dan channel layer bersama)")
+class ScalingCheckTests(SimpleTestCase):
+    """Uji integrasi multi-proses lewat check_scaling, jalan hanya jika REDIS_URL diisi"""
+
+    def test_cache_and_group_send_reach_all_workers(self):
+        out = StringIO()
+        call_command('check_scaling', workers=3, messages=50, timeout=10, stdout=out)
+        self.assertIn("Cache bersama: 3/3", out.getvalue())
+        self.assertIn("Pesan terkirim: 150/150", out.getvalue())
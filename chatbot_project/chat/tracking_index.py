@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .models import DeliveryTracking
+
+logger = logging.getLogger(__name__)
+
+# Delta yang lebih besar dari ini digabung ke blob utama saat refresh
+MAX_DELTA = 10000
+
+
+class SortedBlob:
+    """Nomor resi dengan panjang sama, terurut, disimpan sebagai satu bytes"""
+
+    def __init__(self, width, numbers):
+        self.width = width
+        self.count = len(numbers)
+        self.data = b''.join(numbers)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.data[i * self.width:(i + 1) * self.width]
+
+    def __contains__(self, key):
+        width = self.width
+        data = self.data
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = data[mid * width:(mid + 1) * width]
+            if value < key:
+                lo = mid + 1
+            elif value > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+
+class TrackingIndex:
+    """Index in-memory semua nomor resi untuk lookup exact dan saran typo (edit distance 1).
+
+    Nomor resi dikelompokkan per panjang dalam SortedBlob (~1 byte per karakter).
+    Nomor baru (id > id terakhir) diambil berkala ke delta kecil, dan seluruh
+    index dibangun ulang setiap TRACKING_INDEX_REBUILD detik di thread
+    background agar resi yang dihapus ikut hilang.
+
+    Index bisa tertinggal dari database (resi baru sebelum refresh, atau id
+    yang commit tidak berurutan), jadi miss selalu dikonfirmasi lewat lookup
+    exact di database; hanya saran typo yang murni dari memori.
+    """
+
+    def __init__(self):
+        self._blobs = {}
+        self._delta = set()
+        # Karakter yang pernah muncul di tiap posisi, per panjang resi
+        self._position_chars = {}
+        self._last_id = 0
+        self._loaded = False
+        self._next_refresh = 0.0
+        self._next_rebuild = 0.0
+        self._lock = threading.Lock()
+
+    def __contains__(self, tracking_number):
+        self.ensure_fresh()
+        if self._contains(tracking_number):
+            return True
+        # Lookup exact lewat unique index tracking_number
+        if not DeliveryTracking.objects.filter(tracking_number=tracking_number).exists():
+            return False
+        self._delta = self._delta | {tracking_number}
+        return True
+
+    def _contains(self, tracking_number):
+        if tracking_number in self._delta:
+            return True
+        try:
+            key = tracking_number.encode('ascii')
+        except UnicodeEncodeError:
+            return False
+        blob = self._blobs.get(len(key))
+        return blob is not None and key in blob
+
+    def suggest(self, tracking_number, limit=3):
+        """Nomor resi yang berjarak satu edit (hapus/sisip/ganti/tukar karakter)"""
+        self.ensure_fresh()
+        found = []
+        for candidate in self._edits(tracking_number):
+            if candidate != tracking_number and candidate not in found and self._contains(candidate):
+                found.append(candidate)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def _edits(self, word):
+        """Kandidat edit distance 1, hanya dengan karakter yang pernah ada di posisi tsb"""
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        position_chars = self._position_chars
+
+        if len(word) - 1 in position_chars:
+            for left, right in splits:
+                if right:
+                    yield left + right[1:]
+
+        chars = position_chars.get(len(word))
+        if chars:
+            for left, right in splits:
+                if len(right) > 1:
+                    yield left + right[1] + right[0] + right[2:]
+            for left, right in splits:
+                if right:
+                    for char in chars[len(left)]:
+                        if char != right[0]:
+                            yield left + char + right[1:]
+
+        chars = position_chars.get(len(word) + 1)
+        if chars:
+            for left, right in splits:
+                for char in chars[len(left)]:
+                    yield left + char + right
+
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return
+        # Cukup satu thread yang refresh; request lain tidak pernah menunggu
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if now >= self._next_rebuild:
+                self._start_rebuild()
+            elif self._loaded:
+                self.refresh()
+        finally:
+            self._lock.release()
+
+    def _start_rebuild(self):
+        # Jangan picu refresh/rebuild lagi sampai thread rebuild selesai
+        self._next_refresh = self._next_rebuild = float('inf')
+        threading.Thread(target=self._rebuild_in_background, name='tracking-index-rebuild', daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            with self._lock:
+                self.rebuild()
+        except Exception:
+            logger.exception("Gagal membangun ulang tracking index")
+            self._next_refresh = self._next_rebuild = time.monotonic() + settings.TRACKING_INDEX_REFRESH
+        finally:
+            connection.close()
+
+    def rebuild(self):
+        """Bangun ulang index dari seluruh tabel DeliveryTracking"""
+        rows = DeliveryTracking.objects.order_by().values_list('id', 'tracking_number')
+        self._load(rows.iterator(chunk_size=10000))
+
+    def _load(self, rows):
+        """Isi index dari pasangan (id, tracking_number)"""
+        by_length = {}
+        position_chars = {}
+        last_id = 0
+        for pk, tracking_number in rows:
+            last_id = max(last_id, pk)
+            try:
+                key = tracking_number.encode('ascii')
+            except UnicodeEncodeError:
+                continue
+            by_length.setdefault(len(key), []).append(key)
+            self._add_position_chars(position_chars, tracking_number)
+
+        self._blobs = {width: SortedBlob(width, sorted(keys)) for width, keys in by_length.items()}
+        self._delta = set()
+        self._position_chars = self._freeze_position_chars(position_chars)
+        self._last_id = last_id
+        self._loaded = True
+
+        now = time.monotonic()
+        self._next_refresh = now + settings.TRACKING_INDEX_REFRESH
+        self._next_rebuild = now + settings.TRACKING_INDEX_REBUILD
+
+    def refresh(self):
+        """Tambahkan nomor resi baru (id > id terakhir) ke delta"""
+        rows = (
+            DeliveryTracking.objects.filter(id__gt=self._last_id)
+            .order_by('id')
+            .values_list('id', 'tracking_number')
+        )
+        delta = set(self._delta)
+        position_chars = {
+            length: [set(chars) for chars in positions]
+            for length, positions in self._position_chars.items()
+        }
+        for pk, tracking_number in rows.iterator(chunk_size=10000):
+            self._last_id = pk
+            delta.add(tracking_number)
+            self._add_position_chars(position_chars, tracking_number)
+        self._delta = delta
+        self._position_chars = self._freeze_position_chars(position_chars)
+        self._next_refresh = time.monotonic() + settings.TRACKING_INDEX_REFRESH
+
+        if len(delta) > MAX_DELTA:
+            self._merge_delta()
+
+    @staticmethod
+    def _add_position_chars(position_chars, tracking_number):
+        positions = position_chars.get(len(tracking_number))
+        if positions is None:
+            positions = position_chars[len(tracking_number)] = [set() for _ in tracking_number]
+        for position, char in zip(positions, tracking_number):
+            position.add(char)
+
+    @staticmethod
+    def _freeze_position_chars(position_chars):
+        return {
+            length: [''.join(sorted(chars)) for chars in positions]
+            for length, positions in position_chars.items()
+        }
+
+    def _merge_delta(self):
+        by_length = {}
+        for tracking_number in self._delta:
+            try:
+                key = tracking_number.encode('ascii')
+            except UnicodeEncodeError:
+                continue
+            by_length.setdefault(len(key), []).append(key)
+
+        blobs = dict(self._blobs)
+        for width, keys in by_length.items():
+            existing = list(blobs[width]) if width in blobs else []
+            blobs[width] = SortedBlob(width, sorted(existing + keys))
+        self._blobs = blobs
+        self._delta = set()
+
+
+tracking_index = TrackingIndex()
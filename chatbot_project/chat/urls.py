@@ -6,4 +6,7 @@ urlpatterns = [
     path('api/send-message/', views.send_message, name='send_message'),
     path('api/submit-rating/', views.submit_rating, name='submit_rating'),
     path('api/history/<str:session_id>/', views.chat_history, name='chat_history'),
+    path('api/search/messages/', views.search_messages, name='search_messages'),
+    path('api/export/conversations/', views.export_conversations, name='export_conversations'),
+    path('api/metrics/db/', views.db_metrics, name='db_metrics'),
 ]
\ No newline at end of file
@@ -1,29 +1,73 @@
-from django.shortcuts import render
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import never_cache
+from django.views.decorators.cache import cache_control
+from django.core.cache import cache
+import hashlib
 import json
+import time
 import uuid
 import logging
-from .ai_service import DeliveryAIService
-from .models import ChatSession, Message
+from .ai_service import DeliveryAIService, delivery_cache_key
+from .exports import aiter_sync, iter_conversation_records, iter_gzip, iter_ndjson, parse_export_range
+from .idempotency import idempotent
+from .log import get_stage_timings, stage
+from .models import ChatSession, Message, DeliveryTracking
+from .notifications import subscribe_session
+from .search import search_messages as run_message_search
 
 logger = logging.getLogger(__name__)
 
-@never_cache
+# Halaman chat tidak bergantung pada request/user, jadi hasil render bisa di-cache.
+# Cache sengaja per proses (bukan cache bersama/Redis): HTML berisi URL {% static %}
+# ber-hash dari manifest rilis yang sedang berjalan, dan tidak boleh terbawa ke
+# worker rilis lain setelah deploy.
+INDEX_CACHE_TIMEOUT = 300
+_index_page = {'expires': 0.0, 'page': None}
+
+
+def get_index_page(request):
+    """Render halaman chat sekali per proses, beserta ETag-nya; dipakai ulang dalam satu request"""
+    page = getattr(request, '_index_page', None)
+    if page is not None:
+        return page
+
+    now = time.monotonic()
+    page = _index_page['page']
+    if page is None or now >= _index_page['expires']:
+        html = render_to_string('chat/index.html')
+        page = {
+            'html': html,
+            'etag': hashlib.md5(html.encode()).hexdigest(),
+        }
+        _index_page.update(page=page, expires=now + INDEX_CACHE_TIMEOUT)
+    request._index_page = page
+    return page
+
+
+def index_etag(request):
+    return get_index_page(request)['etag']
+
+
+@cache_control(no_cache=True)
+@condition(etag_func=index_etag)
 def index(request):
     """Main chat page"""
-    return render(request, 'chat/index.html')
+    return HttpResponse(get_index_page(request)['html'])
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent
 def send_message(request):
     """Handle chat messages dengan integrasi OpenAI"""
     try:
         # Parse request data
-        data = json.loads(request.body)
+        with stage('parse'):
+            data = json.loads(request.body)
         user_message = data.get('message', '').strip()
         session_id = data.get('session_id')
         
@@ -44,34 +88,47 @@ def send_message(request):
         if not session_id:
             session_id = str(uuid.uuid4())
             
-        session, created = ChatSession.objects.get_or_create(
-            session_id=session_id,
-            defaults={'is_active': True}
-        )
+        with stage('session'):
+            session, created = ChatSession.objects.get_or_create(
+                session_id=session_id,
+                defaults={'is_active': True}
+            )
         
-        # Log user message
-        logger.info(f"New message from session {session_id}: {user_message[:100]}")
+        # Log user message (format ditunda, di-sample lewat LOG_SAMPLE_RATES)
+        logger.info("New message from session %s: %s", session_id, user_message[:100],
+                    extra={'event': 'message_received', 'session_id': session_id})
         
         # Save user message to database
-        user_msg = Message.objects.create(
-            session=session,
-            content=user_message,
-            is_user=True
-        )
+        with stage('save_user_message'):
+            user_msg = Message.objects.create(
+                session=session,
+                content=user_message,
+                is_user=True
+            )
         
         # Generate AI response menggunakan OpenAI
-        ai_service = DeliveryAIService()
-        bot_response = ai_service.generate_response(user_message)
+        with stage('generate'):
+            ai_service = DeliveryAIService()
+            bot_response, delivery_data = ai_service.generate_response(user_message)
+
+        # Langganan update status untuk nomor resi yang ditanyakan; hasil lookup
+        # generate_response dipakai ulang, tidak cek index/database lagi
+        with stage('subscribe'):
+            if delivery_data is not None:
+                subscribe_session(session, delivery_data['tracking_number'])
         
         # Save bot response to database
-        bot_msg = Message.objects.create(
-            session=session,
-            content=bot_response,
-            is_user=False
-        )
+        with stage('save_bot_message'):
+            bot_msg = Message.objects.create(
+                session=session,
+                content=bot_response,
+                is_user=False
+            )
         
         # Log successful response
-        logger.info(f"AI response generated for session {session_id}: {bot_response[:100]}")
+        logger.info("AI response generated for session %s: %s", session_id, bot_response[:100],
+                    extra={'event': 'response_generated', 'session_id': session_id,
+                           'stages': get_stage_timings()})
         
         return JsonResponse({
             'response': bot_response,
@@ -89,7 +146,7 @@ def send_message(request):
         }, status=400)
         
     except Exception as e:
-        logger.error(f"Error in send_message: {str(e)}")
+        logger.error("Error in send_message: %s", e, extra={'event': 'send_message_error'})
         return JsonResponse({
             'error': 'Terjadi kesalahan server. Silakan coba lagi.',
             'status': 'error',
@@ -98,6 +155,7 @@ def send_message(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent
 def submit_rating(request):
     """Handle rating submission"""
     try:
@@ -117,13 +175,15 @@ def submit_rating(request):
         # Update delivery tracking jika ada tracking number
         if tracking_number:
             try:
-                from .models import DeliveryTracking
                 delivery = DeliveryTracking.objects.get(tracking_number=tracking_number)
                 delivery.rating = rating
                 delivery.save()
-                logger.info(f"Rating {rating} saved for tracking {tracking_number}")
+                cache.delete(delivery_cache_key(tracking_number))
+                logger.info("Rating %s saved for tracking %s", rating, tracking_number,
+                            extra={'event': 'rating_saved'})
             except DeliveryTracking.DoesNotExist:
-                logger.warning(f"Tracking number {tracking_number} not found for rating")
+                logger.warning("Tracking number %s not found for rating", tracking_number,
+                               extra={'event': 'rating_not_found'})
         
         # Generate response berdasarkan rating
         if rating >= 4:
@@ -175,7 +235,7 @@ Hubungi 1500-888 jika butuh bantuan lebih lanjut. 🤝"""
         }, status=400)
         
     except Exception as e:
-        logger.error(f"Error in submit_rating: {str(e)}")
+        logger.error("Error in submit_rating: %s", e, extra={'event': 'submit_rating_error'})
         return JsonResponse({
             'error': 'Gagal menyimpan rating',
             'status': 'error'
@@ -208,8 +268,104 @@ def chat_history(request, session_id):
         }, status=404)
         
     except Exception as e:
-        logger.error(f"Error in chat_history: {str(e)}")
+        logger.error("Error in chat_history: %s", e, extra={'event': 'chat_history_error'})
         return JsonResponse({
             'error': 'Gagal mengambil riwayat chat',
             'status': 'error'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+@require_http_methods(["GET"])
+def db_metrics(request):
+    """Metrics connection pool database untuk monitoring (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({
+            'error': 'Tidak diizinkan',
+            'status': 'error'
+        }, status=403)
+
+    pools = []
+    if settings.DB_POOL_MODE == 'pool':
+        from chatbot_project.db_pool.base import pool_metrics
+        pools = pool_metrics()
+
+    return JsonResponse({
+        'mode': settings.DB_POOL_MODE,
+        'pgbouncer': settings.DB_PGBOUNCER,
+        'pools': pools,
+        'status': 'success'
+    })
+
+
+@require_http_methods(["GET"])
+def export_conversations(request):
+    """Streaming export ChatSession & Message dalam rentang tanggal sebagai NDJSON (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({
+            'error': 'Tidak diizinkan',
+            'status': 'error'
+        }, status=403)
+
+    try:
+        start, end = parse_export_range(request.GET.get('start', ''), request.GET.get('end', ''))
+    except ValueError as e:
+        return JsonResponse({
+            'error': str(e),
+            'status': 'error'
+        }, status=400)
+
+    use_gzip = request.GET.get('gzip') in ('1', 'true')
+    chunks = iter_ndjson(iter_conversation_records(start, end))
+    if use_gzip:
+        chunks = iter_gzip(chunks)
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_sync(chunks)
+
+    filename = f"conversations-{start:%Y%m%d}-{end:%Y%m%d}.ndjson" + ('.gz' if use_gzip else '')
+    response = StreamingHttpResponse(
+        chunks,
+        content_type='application/gzip' if use_gzip else 'application/x-ndjson'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@require_http_methods(["GET"])
+def search_messages(request):
+    """Full-text search isi pesan chat, hasil diurutkan relevansi (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({
+            'error': 'Tidak diizinkan',
+            'status': 'error'
+        }, status=403)
+
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({
+            'error': 'Parameter q tidak boleh kosong',
+            'status': 'error'
+        }, status=400)
+
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+        page_size = min(max(int(request.GET.get('page_size', 20)), 1), 100)
+    except ValueError:
+        return JsonResponse({
+            'error': 'Parameter page tidak valid',
+            'status': 'error'
+        }, status=400)
+
+    results, has_next = run_message_search(query, page, page_size)
+
+    return JsonResponse({
+        'results': [{
+            'id': msg.id,
+            'session_id': msg.session.session_id,
+            'content': msg.content,
+            'is_user': msg.is_user,
+            'timestamp': msg.timestamp.isoformat(),
+            'rank': msg.rank
+        } for msg in results],
+        'page': page,
+        'has_next': has_next,
+        'status': 'success'
+    })
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+PostgreSQL backend dengan connection pool per proses.
+
+Pakai dengan ENGINE 'chatbot_project.db_pool' dan OPTIONS['pool'], lihat settings.py.
+"""
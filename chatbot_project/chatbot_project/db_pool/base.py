@@ -0,0 +1,181 @@
+import collections
+import threading
+import time
+
+from django.db.backends.postgresql.base import Database
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+
+# TRANSACTION_STATUS_IDLE (psycopg2) / TransactionStatus.IDLE (psycopg)
+TRANSACTION_IDLE = 0
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Database.OperationalError):
+    """Checkout melebihi timeout; di-wrap Django menjadi OperationalError"""
+
+
+class ConnectionPool:
+    """Pool koneksi psycopg dengan ukuran terbatas, checkout timeout dan health check"""
+
+    def __init__(self, alias, max_size=10, timeout=5.0, check_interval=30.0):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._idle = collections.deque()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._stats = {
+            'in_use': 0,
+            'opened': 0,
+            'discarded': 0,
+            'checkouts': 0,
+            'timeouts': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+        }
+
+    def getconn(self, connect):
+        """Ambil koneksi dari pool, buat baru via `connect()` jika tidak ada yang idle"""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PoolTimeout(
+                f"Connection pool '{self.alias}' penuh ({self.max_size} koneksi), "
+                f"timeout {self.timeout}s"
+            )
+        waited = time.monotonic() - started
+
+        try:
+            connection = self._checkout_idle()
+            if connection is None:
+                connection = connect()
+                with self._lock:
+                    self._stats['opened'] += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats['in_use'] += 1
+            self._stats['checkouts'] += 1
+            self._stats['wait_total'] += waited
+            self._stats['wait_max'] = max(self._stats['wait_max'], waited)
+        return connection
+
+    def putconn(self, connection):
+        """Kembalikan koneksi ke pool; koneksi rusak atau di tengah transaksi dibuang"""
+        try:
+            if self._reset(connection):
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+            else:
+                self._discard(connection)
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._slots.release()
+
+    def _checkout_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                # LIFO: koneksi yang paling baru dipakai paling mungkin masih sehat
+                connection, returned_at = self._idle.pop()
+            if self._is_usable(connection, returned_at):
+                return connection
+            self._discard(connection)
+
+    def _is_usable(self, connection, returned_at):
+        if connection.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, connection):
+        if connection.closed:
+            return False
+        try:
+            # Transaksi yang tertinggal di-rollback agar tidak bocor ke request lain
+            if connection.info.transaction_status != TRANSACTION_IDLE:
+                connection.rollback()
+            return connection.info.transaction_status == TRANSACTION_IDLE
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        with self._lock:
+            self._stats['discarded'] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), collections.deque()
+        for connection, _ in idle:
+            connection.close()
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+            idle = len(self._idle)
+        checkouts = stats['checkouts']
+        return {
+            'alias': self.alias,
+            'max_size': self.max_size,
+            'in_use': stats['in_use'],
+            'idle': idle,
+            'utilization': stats['in_use'] / self.max_size,
+            'opened': stats['opened'],
+            'discarded': stats['discarded'],
+            'checkouts': checkouts,
+            'timeouts': stats['timeouts'],
+            'wait_avg_ms': stats['wait_total'] / checkouts * 1000 if checkouts else 0.0,
+            'wait_max_ms': stats['wait_max'] * 1000,
+        }
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """Backend PostgreSQL yang meminjam koneksi dari ConnectionPool per proses"""
+
+    def get_pool(self):
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                options = self.settings_dict['OPTIONS'].get('pool') or {}
+                pool = _pools[self.alias] = ConnectionPool(self.alias, **options)
+            return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        parent = super()
+        return self.get_pool().getconn(lambda: parent.get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.get_pool().putconn(self.connection)
+
+
+def pool_metrics():
+    """Metrics semua pool di proses ini"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.metrics() for pool in pools]
+
@@ -32,12 +32,16 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    # 'channels',
+    'django.contrib.postgres',
+    'channels',
     'chat',
 ]
 
 MIDDLEWARE = [
+    'chat.middleware.RequestContextMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'chat.middleware.SamplingProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -67,18 +71,51 @@ TEMPLATES = [
 WSGI_APPLICATION = 'chatbot_project.wsgi.application'
 ASGI_APPLICATION = 'chatbot_project.asgi.application'
 
+# Mode koneksi database:
+# - 'off'        : koneksi baru per request
+# - 'persistent' : koneksi dipakai ulang per thread (CONN_MAX_AGE) + health check.
+#                  Hanya untuk WSGI (gunicorn sync): di ASGI/daphne setiap request
+#                  jalan di thread executor baru, jadi koneksi tidak pernah dipakai
+#                  ulang dan baru tertutup saat garbage collection.
+# - 'pool'       : pool per proses dengan ukuran terbatas dan checkout timeout
+#                  (default, aplikasi ini dilayani lewat ASGI)
+DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'pool')
+
+# Transaction pooling pgbouncer tidak mendukung startup parameter 'options'
+# maupun server-side cursor yang hidup lintas transaksi.
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() == 'true'
+
+DB_OPTIONS = {
+    'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+}
+if DB_PGBOUNCER:
+    # SERIALIZABLE per transaksi lewat driver. Nilai numeriknya beda antara
+    # psycopg2 (3) dan psycopg 3 (4), jadi ambil dari psycopg_any.
+    from django.db.backends.postgresql.psycopg_any import IsolationLevel
+    DB_OPTIONS['isolation_level'] = IsolationLevel.SERIALIZABLE
+else:
+    DB_OPTIONS['options'] = '-c default_transaction_isolation=serializable'
+
+if DB_POOL_MODE == 'pool':
+    DB_OPTIONS['pool'] = {
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '5')),
+        'check_interval': float(os.getenv('DB_POOL_CHECK_INTERVAL', '30')),
+    }
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'chatbot_project.db_pool' if DB_POOL_MODE == 'pool' else 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME', 'your_database_name'),
         'USER': os.getenv('DB_USER', 'your_database_user'),
         'PASSWORD': os.getenv('DB_PASSWORD', 'your_database_password'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
-        'OPTIONS': {
-            'connect_timeout': 60,
-            'options': '-c default_transaction_isolation=serializable'
-        },
+        # Mode pool: koneksi dikembalikan ke pool di akhir setiap request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')) if DB_POOL_MODE == 'persistent' else 0,
+        'CONN_HEALTH_CHECKS': DB_POOL_MODE == 'persistent',
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': DB_OPTIONS,
     }
 }
 
@@ -106,6 +143,17 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic menghasilkan file ber-hash (style.3f2a1b.css) plus versi .gz/.br;
+# WhiteNoise menyajikannya dengan Cache-Control immutable.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -114,9 +162,110 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
-# Channels Configuration
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+# Logging app chat: JSON lewat QueueHandler/QueueListener (I/O di thread background)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FILE = os.getenv('LOG_FILE')  # kosong = stderr
+# Fraksi record yang disimpan per event volume tinggi (WARNING ke atas selalu disimpan)
+LOG_SAMPLE_RATES = {
+    'message_received': float(os.getenv('LOG_SAMPLE_MESSAGES', '0.1')),
+    'response_generated': float(os.getenv('LOG_SAMPLE_MESSAGES', '0.1')),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_context': {
+            '()': 'chat.log.RequestContextFilter',
+        },
+        'sampling': {
+            '()': 'chat.log.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
+    'handlers': {
+        'chat_json': {
+            '()': 'chat.log.BackgroundJsonHandler',
+            'filename': LOG_FILE,
+            'filters': ['sampling', 'request_context'],
+        },
+    },
+    'loggers': {
+        'chat': {
+            'handlers': ['chat_json'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}
+
+# Sampling profiler request (opt-in), laporan: manage.py profile_report
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'False').lower() == 'true'
+PROFILER_SAMPLE_RATE = float(os.getenv('PROFILER_SAMPLE_RATE', '0.01'))
+PROFILER_INTERVAL_MS = float(os.getenv('PROFILER_INTERVAL_MS', '5'))
+PROFILER_DIR = os.getenv('PROFILER_DIR', str(BASE_DIR / 'profiles'))
+
+# Index nomor resi in-memory (detik): ambil resi baru / bangun ulang penuh
+TRACKING_INDEX_REFRESH = 30
+TRACKING_INDEX_REBUILD = 3600
+
+# Idempotency-Key untuk send_message/submit_rating (detik)
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '86400'))
+IDEMPOTENCY_PENDING_TTL = 60  # batas request pertama dianggap masih berjalan
+IDEMPOTENCY_WAIT_TIMEOUT = 30  # lama retry menunggu hasil request pertama
+
+# LLM Router: 'openai' atau 'stub' (lokal, deterministik, untuk offline/benchmark)
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'openai')
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '10'))
+# Batas total satu jawaban termasuk fallback ke model lain; harus di bawah
+# IDEMPOTENCY_PENDING_TTL supaya retry client tidak menjalankan ulang pekerjaan
+LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', '20'))
+LLM_LATENCY_BUDGET = float(os.getenv('LLM_LATENCY_BUDGET', '5'))  # p50 detik
+LLM_MAX_ERROR_RATE = 0.5
+LLM_STATS_WINDOW = 50
+LLM_MIN_SAMPLES = 5
+LLM_COOLDOWN = 30  # detik model dihindari setelah dinilai lambat/error
+LLM_STUB_LATENCY_MS = int(os.getenv('LLM_STUB_LATENCY_MS', '50'))
+
+# Redis (atau server kompatibel) untuk deployment multi-worker.
+# Tanpa REDIS_URL, channel layer dan cache hanya berlaku per proses.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [REDIS_URL],
+                "prefix": "cs-ai",
+                "capacity": int(os.getenv('CHANNEL_CAPACITY', '1000')),
+                "expiry": 60,
+            },
+        }
+    }
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "cs-ai",
+            "TIMEOUT": 300,
+        }
+    }
+    # Cache data pengiriman per nomor resi (detik); aman karena invalidasi
+    # dari import_tracking/submit_rating terlihat oleh semua worker
+    DELIVERY_CACHE_TIMEOUT = int(os.getenv('DELIVERY_CACHE_TIMEOUT', '300'))
+else:
+    # Channels Configuration
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer"
+        }
+    }
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
     }
-}
\ No newline at end of file
+    # LocMemCache terpisah per proses: cache.delete dari proses importer tidak
+    # sampai ke worker web, jadi data pengiriman selalu dibaca dari database
+    DELIVERY_CACHE_TIMEOUT = 0
@@ -1,8 +1,15 @@
 // static/js/chat.js
 
+// Request dengan Idempotency-Key yang sama aman diulang: server mengirim ulang
+// hasil pertama (atau menunggunya jika masih diproses) alih-alih memproses ulang.
+const RETRY_STATUSES = [409, 502, 503, 504];
+const REQUEST_TIMEOUT_MS = 35000;  // di atas LLM_DEADLINE server
+const MAX_RETRIES = 2;
+
 class ChatApp {
     constructor() {
         this.sessionId = null;
+        this.socket = null;
         this.isTyping = false;
         this.currentRating = 0;
         this.messagesContainer = document.getElementById('messagesContainer');
@@ -167,11 +174,13 @@ class ChatApp {
         this.showTypingIndicator();
 
         try {
-            const response = await fetch('/api/send-message/', {
+            // Satu key per pesan, dipakai ulang untuk setiap retry pesan yang sama
+            const response = await this.fetchWithRetry('/api/send-message/', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
-                    'X-CSRFToken': this.getCSRFToken()
+                    'X-CSRFToken': this.getCSRFToken(),
+                    'Idempotency-Key': this.newIdempotencyKey()
                 },
                 body: JSON.stringify({
                     message: message,
@@ -183,6 +192,7 @@ class ChatApp {
 
             if (response.ok && data.status === 'success') {
                 this.sessionId = data.session_id;
+                this.connectUpdates();
 
                 // Realistic typing delay
                 const typingDelay = Math.min(Math.max(data.response.length * 30, 1000), 3000);
@@ -225,6 +235,61 @@ Maaf atas ketidaknyamanan ini. 🙏`;
         }
     }
 
+    async fetchWithRetry(url, options) {
+        // Retry saat timeout, error jaringan, atau server sibuk; options (termasuk
+        // Idempotency-Key dan body) sama persis di setiap percobaan
+        for (let attempt = 0; ; attempt++) {
+            const controller = new AbortController();
+            const timer = setTimeout(() => controller.abort(), REQUEST_TIMEOUT_MS);
+            let retryReason;
+            try {
+                const response = await fetch(url, { ...options, signal: controller.signal });
+                if (attempt >= MAX_RETRIES || !RETRY_STATUSES.includes(response.status)) {
+                    return response;
+                }
+                retryReason = `HTTP ${response.status}`;
+            } catch (error) {
+                if (attempt >= MAX_RETRIES) throw error;
+                retryReason = error.name === 'AbortError' ? 'timeout' : error.message;
+            } finally {
+                clearTimeout(timer);
+            }
+
+            console.warn(`🔁 Retry ${attempt + 1}/${MAX_RETRIES} ${url} (${retryReason})`);
+            await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt));
+        }
+    }
+
+    newIdempotencyKey() {
+        if (window.crypto && window.crypto.randomUUID) {
+            return window.crypto.randomUUID();
+        }
+        return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    }
+
+    connectUpdates() {
+        // WebSocket untuk push update status paket (menggantikan "cek resi" berulang)
+        if (!this.sessionId || !('WebSocket' in window)) return;
+        if (this.socket && this.socket.readyState <= WebSocket.OPEN) return;
+
+        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        this.socket = new WebSocket(`${protocol}://${window.location.host}/ws/chat/${this.sessionId}/`);
+
+        this.socket.addEventListener('message', (event) => {
+            const data = JSON.parse(event.data);
+            if (data.type === 'tracking_update') {
+                console.log('🔔 Tracking update:', data);
+                this.addMessage(data.message, 'bot');
+                this.showToast('Update Paket', `${data.tracking_number} diperbarui`, 'success');
+            }
+        });
+
+        this.socket.addEventListener('close', () => {
+            // Reconnect setelah jeda singkat
+            setTimeout(() => this.connectUpdates(), 5000);
+        });
+    }
+
     addMessage(content, sender) {
         if (!this.messagesContainer) return;
 
@@ -484,11 +549,12 @@ Atau <button onclick="chatApp.showRatingModal()" class="text-link">buka form rat
         console.log(`⚡ Quick rating submitted: ${rating}`);
 
         try {
-            const response = await fetch('/api/submit-rating/', {
+            const response = await this.fetchWithRetry('/api/submit-rating/', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
-                    'X-CSRFToken': this.getCSRFToken()
+                    'X-CSRFToken': this.getCSRFToken(),
+                    'Idempotency-Key': this.newIdempotencyKey()
                 },
                 body: JSON.stringify({
                     rating: rating,
@@ -554,11 +620,12 @@ Atau <button onclick="chatApp.showRatingModal()" class="text-link">buka form rat
         }
 
         try {
-            const response = await fetch('/api/submit-rating/', {
+            const response = await this.fetchWithRetry('/api/submit-rating/', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
-                    'X-CSRFToken': this.getCSRFToken()
+                    'X-CSRFToken': this.getCSRFToken(),
+                    'Idempotency-Key': this.newIdempotencyKey()
                 },
                 body: JSON.stringify({
                     rating: this.currentRating,